@@ -99,9 +99,18 @@ class UtilityBasedDeliveryAgent:
 
         return best_action, best_utility
 
-    def run(self, world_state, max_steps=20):
+    def run(self, world_state, max_steps=20, trace=None):
         """Run the utility-based agent"""
         self.perceive(world_state)
+        if trace is not None:
+            # Quiet run: each step is recorded as (step, position, action, utility, has_package)
+            for step in range(1, max_steps + 1):
+                action, utility = self.act()
+                trace.append((step, self.position, action, utility, self.has_package))
+                if self.package_delivered:
+                    return True
+            return False
+
         print("\nUtility-Based Agent Starting!")
         print(f"Package at: {self.world.package_location}, Deliver to: {self.world.delivery_location}")
         print("=" * 40)
@@ -242,8 +251,17 @@ class RiverProblemSolvingAgent:
         north_str = ", ".join(north_bank) if north_bank else "Empty"
         return f"South: [{south_str}] | North: [{north_str}]"
 
-    def print_solution(self, path):
-        """Prints the solution path in a human-readable format."""
+    def print_solution(self, path, trace=None):
+        """
+        Prints the solution path in a human-readable format.
+        With a TraceBuffer nothing is printed: each step is recorded as a
+        (step, state) tuple instead.
+        """
+        if trace is not None:
+            for i, state in enumerate(path or ()):
+                trace.append((i, state))
+            return
+
         if not path:
             print("No solution found.")
             return
@@ -1,5 +1,32 @@
 from collections import deque
 
+from move_tables import move_table
+from search import bounded_bfs
+
+# Field names for TraceBuffer records written by print_solution()
+SOLUTION_TRACE_FIELDS = ("step", "missionaries", "cannibals", "boat")
+
+# Possible moves: (Missionaries, Cannibals) to move, for a boat for two
+MOVES = move_table(2)
+
+
+def valid_counts(missionaries, cannibals):
+    # Check bounds
+    if missionaries < 0 or cannibals < 0 or missionaries > 3 or cannibals > 3:
+        return False
+
+    # Check Left bank constraints
+    if missionaries > 0 and missionaries < cannibals:
+        return False
+
+    # Check Right bank constraints
+    m_right = 3 - missionaries
+    c_right = 3 - cannibals
+    if m_right > 0 and m_right < c_right:
+        return False
+
+    return True
+
 
 class State:
     def __init__(self, missionaries, cannibals, boat):
@@ -9,21 +36,7 @@ class State:
         self.parent = None  # To trace the path back
 
     def is_valid(self):
-        # Check bounds
-        if self.missionaries < 0 or self.cannibals < 0 or self.missionaries > 3 or self.cannibals > 3:
-            return False
-
-        # Check Left bank constraints
-        if self.missionaries > 0 and self.missionaries < self.cannibals:
-            return False
-
-        # Check Right bank constraints
-        m_right = 3 - self.missionaries
-        c_right = 3 - self.cannibals
-        if m_right > 0 and m_right < c_right:
-            return False
-
-        return True
+        return valid_counts(self.missionaries, self.cannibals)
 
     def is_goal(self):
         return self.missionaries == 0 and self.cannibals == 0 and self.boat == 0
@@ -42,24 +55,19 @@ class State:
 
 
 def get_successors(current_state):
-    successors = []
-    # Possible moves: (Missionaries, Cannibals) to move
-    moves = [(1, 0), (2, 0), (0, 1), (0, 2), (1, 1)]
-
+    """Yields the valid successor states; counts are checked before a State is built."""
     # If boat is on Left (1), we subtract; if on Right (0), we add to Left bank
     direction = -1 if current_state.boat == 1 else 1
-
-    for m, c in moves:
-        new_m = current_state.missionaries + (direction * m)
-        new_c = current_state.cannibals + (direction * c)
-        new_boat = 1 - current_state.boat
-
-        new_state = State(new_m, new_c, new_boat)
-        if new_state.is_valid():
+    missionaries, cannibals = current_state.missionaries, current_state.cannibals
+    new_boat = 1 - current_state.boat
+
+    for m, c in MOVES.moves:
+        new_m = missionaries + direction * m
+        new_c = cannibals + direction * c
+        if valid_counts(new_m, new_c):
+            new_state = State(new_m, new_c, new_boat)
             new_state.parent = current_state
-            successors.append(new_state)
-
-    return successors
+            yield new_state
 
 
 def solve_bfs():
@@ -84,7 +92,30 @@ def solve_bfs():
     return None
 
 
-def print_solution(solution):
+def solve_bfs_with_budget(deadline=None, progress=None):
+    """
+    BFS that stops at a deadline (a time.monotonic() timestamp) or when the
+    progress callback (called with a search.LayerEvent per layer) returns
+    False.  Always returns a search.SearchResult; its path is a list of
+    State objects, and the last one can be passed to print_solution().
+    """
+    return bounded_bfs(_BfsProblem(), deadline, progress=progress)
+
+
+class _BfsProblem:
+    # What search.bounded_bfs needs, over this module's State objects
+    def __init__(self):
+        self.START_STATE = State(3, 3, 1)
+        self.GOAL_STATE = State(0, 0, 0)
+
+    next_states = staticmethod(get_successors)
+
+    @staticmethod
+    def heuristic(state):
+        return state.missionaries + state.cannibals
+
+
+def print_solution(solution, trace=None):
     path = []
     curr = solution
     while curr:
@@ -92,6 +123,12 @@ def print_solution(solution):
         curr = curr.parent
     path.reverse()
 
+    # Quiet mode: record each step instead of printing it
+    if trace is not None:
+        for i, state in enumerate(path):
+            trace.append((i, state.missionaries, state.cannibals, state.boat))
+        return
+
     print("Missionaries & Cannibals Solution (BFS):")
     print("-" * 50)
     for i, state in enumerate(path):
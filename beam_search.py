@@ -0,0 +1,172 @@
+import heapq
+import math
+import time
+
+from search import SearchResult
+
+
+# --- Beam search for instances too large for exact BFS ---
+# Each layer keeps only the `width` best states by score (lower is better,
+# the puzzle's heuristic by default), so memory is bounded by width x depth
+# for the paths plus whatever the visited structure takes.  With a
+# false_positive_rate the visited set is a fixed-size Bloom filter: a false
+# positive only makes the search skip a state it has not really seen.
+#
+# The answer is reported as proven ("proven" in stats) when no state was
+# pruned and the visited set was exact (then the beam did a full BFS), or
+# when the path is as short as the admissible heuristic allows.  Otherwise
+# it is a best-effort result.
+
+MASK64 = (1 << 64) - 1
+
+
+def _mix64(value):
+    """splitmix64 finalizer: spreads Python's hash over all 64 bits."""
+    value = (value + 0x9E3779B97F4A7C15) & MASK64
+    value = ((value ^ (value >> 30)) * 0xBF58476D1CE4E5B9) & MASK64
+    value = ((value ^ (value >> 27)) * 0x94D049BB133111EB) & MASK64
+    return value ^ (value >> 31)
+
+
+class BloomFilter:
+    def __init__(self, capacity, false_positive_rate=0.01):
+        if capacity < 1:
+            raise ValueError(f"capacity must be at least 1, got {capacity}")
+        if not 0 < false_positive_rate < 1:
+            raise ValueError(f"false_positive_rate must be between 0 and 1, got {false_positive_rate}")
+        self.capacity = capacity
+        self.false_positive_rate = false_positive_rate
+        self.size = max(8, math.ceil(-capacity * math.log(false_positive_rate) / math.log(2) ** 2))
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def _positions(self, item):
+        # Double hashing: k positions from two 64-bit hashes
+        h1 = _mix64(hash(item) & MASK64)
+        h2 = _mix64(h1) | 1
+        size = self.size
+        return [(h1 + i * h2) % size for i in range(self.hash_count)]
+
+    def add(self, item):
+        """Adds item; returns False if it was (probably) already there."""
+        bits = self.bits
+        new = False
+        for position in self._positions(item):
+            byte, mask = position >> 3, 1 << (position & 7)
+            if not bits[byte] & mask:
+                bits[byte] |= mask
+                new = True
+        if new:
+            self.count += 1
+        return new
+
+    def __contains__(self, item):
+        bits = self.bits
+        return all(bits[p >> 3] & 1 << (p & 7) for p in self._positions(item))
+
+    def __len__(self):
+        return self.count
+
+    @property
+    def nbytes(self):
+        return len(self.bits)
+
+
+class _ExactVisited(set):
+    def add(self, item):
+        if item in self:
+            return False
+        super().add(item)
+        return True
+
+
+def beam_search(puzzle, width=1000, score=None, false_positive_rate=None, expected_states=1 << 20,
+                deadline=None, max_depth=None):
+    """
+    Layered beam search.  score(state) ranks the states of a layer (lower
+    is better).  Returns a SearchResult; status is "solved", "no_solution"
+    (the beam died out), or "timeout" (deadline, a time.monotonic()
+    timestamp, or max_depth reached).  stats["proven"] says whether the
+    answer is known to be optimal (or, for "no_solution", exhaustive).
+    """
+    score = score or puzzle.heuristic
+    start, goal = puzzle.START_STATE, puzzle.GOAL_STATE
+    started = time.monotonic()
+    if false_positive_rate is None:
+        visited = _ExactVisited()
+    else:
+        visited = BloomFilter(expected_states, false_positive_rate)
+    exact = false_positive_rate is None
+    lower_bound = puzzle.heuristic(start)
+
+    # A beam entry is (state, parent entry): only chains still in the beam stay alive
+    beam = [(start, None)]
+    visited.add(start)
+    depth = expanded = pruned = 0
+
+    def result(status, entry=None, best=None):
+        path = partial = None
+        chain = entry or best
+        if chain is not None:
+            states = []
+            while chain is not None:
+                states.append(chain[0])
+                chain = chain[1]
+            states.reverse()
+            path, partial = (states, None) if entry is not None else (None, states)
+        proven = pruned == 0 and exact
+        if status == "solved" and len(path) - 1 <= lower_bound:
+            proven = True
+        stats = {"expanded": expanded, "visited": len(visited), "depth": depth, "pruned": pruned,
+                 "proven": proven and status != "timeout", "elapsed": time.monotonic() - started}
+        if not exact:
+            stats["filter_bytes"] = visited.nbytes
+        return SearchResult(status, path, best and best[0], partial, stats)
+
+    if start == goal:
+        return result("solved", beam[0])
+
+    while beam:
+        if max_depth is not None and depth >= max_depth or deadline is not None and time.monotonic() >= deadline:
+            return result("timeout", best=min(beam, key=lambda entry: score(entry[0])))
+        candidates = []
+        for entry in beam:
+            expanded += 1
+            for next_state in puzzle.next_states(entry[0]):
+                if visited.add(next_state):
+                    candidates.append((next_state, entry))
+        depth += 1
+        for candidate in candidates:
+            if candidate[0] == goal:
+                return result("solved", candidate)
+        if len(candidates) > width:
+            pruned += len(candidates) - width
+            candidates = heapq.nsmallest(width, candidates, key=lambda entry: score(entry[0]))
+        beam = candidates
+    return result("no_solution")
+
+
+if __name__ == "__main__":
+    from pattern_db import PatternDatabase
+    from river_puzzle import RiverPuzzle
+
+    # Small enough to check: the 16-item instance of pattern_db.py (optimal: 11)
+    items = [f"Item{i}" for i in range(16)]
+    eats = [(1, 14), (1, 4), (10, 5), (11, 9), (10, 9), (6, 7), (10, 11), (0, 7), (5, 7), (10, 4), (10, 15)]
+    puzzle = RiverPuzzle(items=items, eats=[(items[a], items[b]) for a, b in eats], boat_capacity=4)
+    database = PatternDatabase(puzzle)
+    for width in (10, 100, 1000):
+        result = beam_search(puzzle, width=width, score=database)
+        print(f"16 items, width {width}: {result.status} in {len(result.path) - 1} steps, "
+              f"proven={result.stats['proven']}, {result.stats['expanded']} expansions")
+
+    # 2^25 states, too many for a dict-based BFS; the Bloom filter stays at 1.9 MB
+    items = [f"Item{i}" for i in range(24)]
+    puzzle = RiverPuzzle(items=items, eats=[("Item0", "Item1"), ("Item1", "Item2")], boat_capacity=3)
+    for width in (20, 200):
+        result = beam_search(puzzle, width=width, false_positive_rate=0.001, expected_states=1 << 20)
+        print(f"24 items, width {width}: {result.status} in {len(result.path) - 1} steps "
+              f"(lower bound {puzzle.heuristic(0)}), proven={result.stats['proven']}, "
+              f"{result.stats['visited']} states touched, {result.stats['filter_bytes'] / 1e6:.1f} MB filter, "
+              f"{result.stats['elapsed']:.1f} s")
@@ -0,0 +1,165 @@
+import json
+import os
+import struct
+import time
+from array import array
+
+from search import LayerEvent, _path_to
+
+
+# --- Checkpoint / resume for long breadth-first searches ---
+# At layer boundaries the whole search state fits in three arrays of
+# integer-encoded states (puzzle.encode / puzzle.decode):
+#   frontier   the next layer, in order
+#   visited    every state seen so far, in discovery order
+#   parents    the parent of each visited state (-1 for the start)
+# plus the depth and counters.  The file is written to a temporary name and
+# renamed over the old checkpoint, so a crash never leaves a torn file.
+# Resuming continues with the same layer order, so it finds exactly the
+# path an uninterrupted run would.  A search stopped by its progress
+# callback saves a checkpoint first; a finished search (solved or not)
+# deletes it, so a later run cannot resume from a stale file.
+
+MAGIC = b"BFSCKPT1"
+_HEADER = struct.Struct("<8sIQQQQI")  # magic, depth, expanded, frontier, visited, elapsed (us), spec length
+
+
+def save_checkpoint(filename, puzzle, depth, layer, parents, expanded, elapsed):
+    encode = puzzle.encode
+    frontier = array("q", [encode(state) for state in layer])
+    visited = array("q", [encode(state) for state in parents])
+    parent_codes = array("q", [-1 if parent is None else encode(parent) for parent in parents.values()])
+    spec = json.dumps(puzzle.spec(), sort_keys=True).encode()
+
+    temp_name = f"{filename}.tmp"
+    with open(temp_name, "wb") as f:
+        f.write(_HEADER.pack(MAGIC, depth, expanded, len(frontier), len(visited),
+                             int(elapsed * 1e6), len(spec)))
+        f.write(spec)
+        frontier.tofile(f)
+        visited.tofile(f)
+        parent_codes.tofile(f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temp_name, filename)
+
+
+def load_checkpoint(filename, puzzle):
+    """Returns (depth, layer, parents, expanded, elapsed) saved for this puzzle."""
+    with open(filename, "rb") as f:
+        magic, depth, expanded, frontier_count, visited_count, elapsed_us, spec_length = \
+            _HEADER.unpack(f.read(_HEADER.size))
+        if magic != MAGIC:
+            raise ValueError(f"{filename} is not a search checkpoint")
+        if json.loads(f.read(spec_length)) != puzzle.spec():
+            raise ValueError(f"{filename} was written for a different puzzle")
+        frontier, visited, parent_codes = array("q"), array("q"), array("q")
+        frontier.fromfile(f, frontier_count)
+        visited.fromfile(f, visited_count)
+        parent_codes.fromfile(f, visited_count)
+
+    decode = puzzle.decode
+    layer = [decode(code) for code in frontier]
+    parents = {decode(code): None if parent == -1 else decode(parent)
+               for code, parent in zip(visited, parent_codes)}
+    return depth, layer, parents, expanded, elapsed_us / 1e6
+
+
+def checkpointed_bfs(puzzle, filename, every_layers=1, every_seconds=None, resume=True, progress=None):
+    """
+    Layered BFS that writes a checkpoint every every_layers layers (or
+    every_seconds, whichever comes first).  If resume is set and the file
+    exists, the search continues from it.  progress is called with a
+    search.LayerEvent per layer; returning False saves a checkpoint and
+    stops the search.  The checkpoint is deleted once the search finishes.
+    Returns the path, or None.
+    """
+    if resume and os.path.exists(filename):
+        depth, layer, parents, expanded, elapsed = load_checkpoint(filename, puzzle)
+    else:
+        depth, layer, parents, expanded, elapsed = 0, [puzzle.START_STATE], {puzzle.START_STATE: None}, 0, 0.0
+    return _run(puzzle, filename, depth, layer, parents, expanded, elapsed,
+                every_layers, every_seconds, progress)
+
+
+def resume_bfs(puzzle, filename, every_layers=1, every_seconds=None, progress=None):
+    """Continues a search from an existing checkpoint file."""
+    depth, layer, parents, expanded, elapsed = load_checkpoint(filename, puzzle)
+    return _run(puzzle, filename, depth, layer, parents, expanded, elapsed,
+                every_layers, every_seconds, progress)
+
+
+def _run(puzzle, filename, depth, layer, parents, expanded, elapsed, every_layers, every_seconds, progress):
+    goal = puzzle.GOAL_STATE
+    started = time.monotonic() - elapsed
+    last_saved_depth, last_saved_at = depth, time.monotonic()
+
+    while layer:
+        if goal in parents:
+            _remove_checkpoint(filename)
+            return _path_to(goal, parents)
+
+        due = depth - last_saved_depth >= every_layers or (
+            every_seconds is not None and time.monotonic() - last_saved_at >= every_seconds)
+        if due:
+            save_checkpoint(filename, puzzle, depth, layer, parents, expanded, time.monotonic() - started)
+            last_saved_depth, last_saved_at = depth, time.monotonic()
+
+        next_layer = []
+        for state in layer:
+            expanded += 1
+            for next_state in puzzle.next_states(state):
+                if next_state not in parents:
+                    parents[next_state] = state
+                    next_layer.append(next_state)
+        layer = next_layer
+        depth += 1
+        if progress is not None:
+            event = LayerEvent(depth, len(layer), len(parents), time.monotonic() - started)
+            if progress(event) is False:
+                save_checkpoint(filename, puzzle, depth, layer, parents, expanded, time.monotonic() - started)
+                return None
+    _remove_checkpoint(filename)
+    return None
+
+
+def _remove_checkpoint(filename):
+    if os.path.exists(filename):
+        os.remove(filename)
+
+
+def _crashing_run(spec, filename):
+    from puzzle_specs import puzzle_from_spec
+    checkpointed_bfs(puzzle_from_spec(spec), filename, resume=False)
+
+
+if __name__ == "__main__":
+    import multiprocessing
+    import tempfile
+
+    from puzzle_specs import puzzle_from_spec
+
+    spec = {"type": "river", "items": [f"Item{i}" for i in range(16)],
+            "eats": [["Item0", "Item1"], ["Item2", "Item3"]], "boat_capacity": 2}
+    puzzle = puzzle_from_spec(spec)
+    filename = os.path.join(tempfile.gettempdir(), "river16.ckpt")
+
+    # Kill a run part-way through, as if the machine crashed
+    worker = multiprocessing.Process(target=_crashing_run, args=(spec, filename))
+    worker.start()
+    time.sleep(1.5)
+    worker.kill()
+    worker.join()
+    depth = load_checkpoint(filename, puzzle)[0]
+    print(f"Crashed run left a checkpoint at depth {depth} ({os.path.getsize(filename)} bytes)")
+
+    resumed = resume_bfs(puzzle, filename)
+    uninterrupted = puzzle.solve()
+    print(f"Resumed run: {len(resumed) - 1} steps, same path as an uninterrupted run: {resumed == uninterrupted}")
+    assert not os.path.exists(filename)  # A finished search leaves nothing to resume from
+
+    # Stop a run from its progress callback: the checkpoint is saved first
+    assert checkpointed_bfs(puzzle, filename, every_layers=100, progress=lambda event: event.depth < 3) is None
+    depth = load_checkpoint(filename, puzzle)[0]
+    resumed = checkpointed_bfs(puzzle, filename)
+    print(f"Stopped at depth {depth} by the progress callback, resumed: same path {resumed == uninterrupted}")
@@ -0,0 +1,132 @@
+import argparse
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from lab1 import UtilityBasedDeliveryAgent, WorldState
+
+
+# --- Monte Carlo evaluation of delivery agents ---
+# Runs many randomized episodes of the one-line delivery world: the agent
+# starts on a random cell, and the package and delivery location are
+# random cells within the bounds.  Episodes are grouped in fixed-size
+# chunks and chunk i always draws its worlds from random.Random(f"{seed}/{i}"),
+# so the results depend only on the seed, the episode count and the chunk
+# size, never on how many workers ran the chunks or in which order.
+# Every chunk returns integer sums, which add up the same way in any order.
+#
+# Reward constants (UtilityBasedDeliveryAgent.REWARD_NAMES) are set per run:
+#   python delivery_eval.py --episodes 1000000 --workers 4 --reward DISTANCE_WEIGHT=1
+
+COUNTERS = ("episodes", "successes", "steps", "success_steps", "excess_steps")
+
+
+def optimal_steps(start, package, delivery):
+    """Fewest actions for a delivery: walk, pick up, walk, deliver."""
+    return abs(start - package) + abs(package - delivery) + 2
+
+
+def evaluate_chunk(seed, chunk, episodes, rewards=None, bounds=(0, 10), max_steps=50,
+                   agent_class=UtilityBasedDeliveryAgent):
+    """Runs the episodes of one chunk; returns a {counter: sum} dict."""
+    rng = random.Random(f"{seed}/{chunk}")
+    agent = agent_class(bounds=bounds)
+    for name, value in (rewards or {}).items():
+        setattr(agent, name, value)
+    low, high = bounds
+    totals = dict.fromkeys(COUNTERS, 0)
+    for _ in range(episodes):
+        start, package, delivery = rng.randint(low, high), rng.randint(low, high), rng.randint(low, high)
+        agent.position, agent.has_package, agent.package_delivered = start, False, False
+        agent.perceive(WorldState(package, delivery))
+        act = agent.act
+        steps = 0
+        while steps < max_steps and not agent.package_delivered:
+            act()
+            steps += 1
+        totals["steps"] += steps
+        if agent.package_delivered:
+            totals["successes"] += 1
+            totals["success_steps"] += steps
+            totals["excess_steps"] += steps - optimal_steps(start, package, delivery)
+    totals["episodes"] = episodes
+    return totals
+
+
+def _evaluate_chunk(args):
+    return evaluate_chunk(*args)
+
+
+def evaluate(episodes, seed=0, workers=1, chunk_size=10000, rewards=None, bounds=(0, 10), max_steps=50,
+             agent_class=UtilityBasedDeliveryAgent):
+    """
+    Evaluates an agent class with the given reward constants over
+    `episodes` random episodes.  Returns a summary dict.
+    """
+    sizes = [chunk_size] * (episodes // chunk_size)
+    if episodes % chunk_size:
+        sizes.append(episodes % chunk_size)
+    jobs = [(seed, chunk, size, rewards, bounds, max_steps, agent_class) for chunk, size in enumerate(sizes)]
+
+    started = time.perf_counter()
+    totals = dict.fromkeys(COUNTERS, 0)
+    if workers == 1:
+        for result in map(_evaluate_chunk, jobs):
+            for name in COUNTERS:
+                totals[name] += result[name]
+    else:
+        with ProcessPoolExecutor(workers) as executor:
+            # Several chunks per task keep the inter-process traffic low
+            for result in executor.map(_evaluate_chunk, jobs, chunksize=max(1, len(jobs) // (8 * workers))):
+                for name in COUNTERS:
+                    totals[name] += result[name]
+    elapsed = time.perf_counter() - started
+
+    successes = totals["successes"]
+    return {
+        "episodes": totals["episodes"],
+        "successes": successes,
+        "success_rate": successes / episodes if episodes else 0.0,
+        "mean_steps": totals["steps"] / episodes if episodes else 0.0,
+        "mean_success_steps": totals["success_steps"] / successes if successes else None,
+        "mean_excess_steps": totals["excess_steps"] / successes if successes else None,
+        "elapsed": elapsed,
+        "episodes_per_second": episodes / elapsed if elapsed else 0.0,
+        "totals": totals,
+    }
+
+
+def _parse_reward(text):
+    name, _, value = text.partition("=")
+    if name not in UtilityBasedDeliveryAgent.REWARD_NAMES:
+        raise argparse.ArgumentTypeError(f"unknown reward constant {name!r}")
+    try:
+        return name, float(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"{text!r} is not NAME=NUMBER") from None
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Monte Carlo evaluation of UtilityBasedDeliveryAgent")
+    parser.add_argument("--episodes", type=int, default=200000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=1, help="evaluation processes")
+    parser.add_argument("--chunk-size", type=int, default=10000, help="episodes per chunk (part of the seed)")
+    parser.add_argument("--max-steps", type=int, default=50, help="steps before an episode counts as failed")
+    parser.add_argument("--bounds", type=int, nargs=2, default=(0, 10), metavar=("LOW", "HIGH"))
+    parser.add_argument("--reward", type=_parse_reward, action="append", default=[], metavar="NAME=VALUE",
+                        help="override a reward constant, e.g. DISTANCE_WEIGHT=1 (repeatable)")
+    args = parser.parse_args()
+
+    rewards = dict(args.reward)
+    summary = evaluate(args.episodes, args.seed, args.workers, args.chunk_size, rewards,
+                       tuple(args.bounds), args.max_steps)
+    print(f"Rewards: {dict(UtilityBasedDeliveryAgent().rewards(), **rewards)}")
+    print(f"{summary['episodes']} episodes, seed {args.seed}, {args.workers} worker(s)")
+    print(f"Success rate: {summary['success_rate']:.4%}")
+    if summary["successes"]:
+        print(f"Mean steps: {summary['mean_steps']:.3f} (successful episodes: "
+              f"{summary['mean_success_steps']:.3f}, {summary['mean_excess_steps']:.3f} above optimal)")
+    else:
+        print(f"Mean steps: {summary['mean_steps']:.3f} (no successful episode)")
+    print(f"Throughput: {summary['episodes_per_second']:,.0f} episodes/s ({summary['elapsed']:.2f} s)")
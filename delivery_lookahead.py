@@ -0,0 +1,165 @@
+import time
+
+from lab1 import UtilityBasedDeliveryAgent
+
+
+# --- Depth-k lookahead for the delivery agent ---
+# The greedy agent of lab1.py only compares the utilities of its next
+# action, so with some reward constants it walks away from the package and
+# stalls against a world bound.  LookaheadDeliveryAgent scores an action by
+# its utility plus the discounted value of the best continuation, over the
+# same utility functions, k actions deep (depth 1 is the greedy choice).
+# With slip > 0 a move fails with that probability and the agent stays
+# put, and the search becomes an expectimax over both outcomes.
+#
+# Every decision deepens k = 1, 2, ... until max_depth or until its
+# time_budget (seconds) runs out, and acts on the deepest search that
+# finished.  Values are kept in a transposition table keyed on the agent
+# and world state plus the depth left, so positions reached along several
+# paths, and by the searches of later decisions, are only valued once.
+# A shared DecisionCache keys the decisions on the search settings as well,
+# so they never mix with the greedy agent's; with a time budget a cached
+# decision is the one the first search under that budget reached.
+
+
+class _OutOfTime(Exception):
+    pass
+
+
+class LookaheadDeliveryAgent(UtilityBasedDeliveryAgent):
+    def __init__(self, decision_cache=None, bounds=(0, 10), max_depth=30, time_budget=0.005,
+                 discount=0.95, slip=0.0, table_size=1 << 16):
+        super().__init__(decision_cache, bounds)
+        self.max_depth = max_depth
+        self.time_budget = time_budget
+        self.discount = discount
+        self.slip = slip
+        self.table_size = table_size
+        self.table = {}  # Transposition table: key -> value
+        self.rewards_key = None  # The reward constants of the current decision
+        self.stats = {"decisions": 0, "nodes": 0, "table_hits": 0, "depth_total": 0, "timeouts": 0}
+
+    def _actions_at(self, position, has_package):
+        """[(action, utility)] the greedy agent would weigh at this state."""
+        saved = self.position, self.has_package
+        self.position, self.has_package = position, has_package
+        try:
+            actions = ["move_left", "move_right"]
+            if position == self.world.package_location and not has_package:
+                actions.append("pickup_package")
+            if position == self.world.delivery_location and has_package:
+                actions.append("package_delivered")
+            utilities = {"move_left": self._utility_move(-1), "move_right": self._utility_move(1),
+                         "pickup_package": self._utility_pickup(),
+                         "package_delivered": self._utility_deliver()}
+            return [(action, utilities[action]) for action in actions]
+        finally:
+            self.position, self.has_package = saved
+
+    def _outcomes(self, position, has_package, action):
+        """[(probability, position, has_package, delivered)] after an action."""
+        if action == "pickup_package":
+            return [(1.0, position, True, False)]
+        if action == "package_delivered":
+            return [(1.0, position, False, True)]
+        moved = position + (1 if action == "move_right" else -1)
+        low, high = self.bounds
+        if not low <= moved <= high:
+            return [(1.0, position, has_package, False)]  # Walking off the world goes nowhere
+        if self.slip:
+            return [(1.0 - self.slip, moved, has_package, False), (self.slip, position, has_package, False)]
+        return [(1.0, moved, has_package, False)]
+
+    def _q_value(self, position, has_package, action, utility, depth, deadline):
+        value = utility
+        if depth > 1:
+            for probability, next_position, next_has, delivered in self._outcomes(position, has_package, action):
+                if not delivered:
+                    value += self.discount * probability * self._value(next_position, next_has, depth - 1, deadline)
+        return value
+
+    def _value(self, position, has_package, depth, deadline):
+        """Best expected discounted utility of the next `depth` actions."""
+        key = (position, has_package, depth, self.world.package_location, self.world.delivery_location,
+               self.bounds, self.rewards_key)
+        value = self.table.get(key)
+        if value is not None:
+            self.stats["table_hits"] += 1
+            return value
+        self.stats["nodes"] += 1
+        if time.perf_counter() >= deadline:
+            raise _OutOfTime
+        value = max(self._q_value(position, has_package, action, utility, depth, deadline)
+                    for action, utility in self._actions_at(position, has_package))
+        if len(self.table) >= self.table_size:
+            self.table.clear()
+        self.table[key] = value
+        return value
+
+    def _decision_key(self):
+        return super()._decision_key() + (type(self), self.max_depth, self.discount, self.slip, self.time_budget)
+
+    def _choose_action(self):
+        """Choose the action with the best k-step lookahead value"""
+        deadline = time.perf_counter() + self.time_budget
+        self.rewards_key = tuple(self.rewards().values())
+        actions = self._actions_at(self.position, self.has_package)
+        best = max(actions, key=lambda entry: entry[1])  # Depth 1: the greedy choice
+        depth = 1
+        while depth < self.max_depth:
+            try:
+                values = [self._q_value(self.position, self.has_package, action, utility, depth + 1, deadline)
+                          for action, utility in actions]
+            except _OutOfTime:
+                self.stats["timeouts"] += 1
+                break
+            depth += 1
+            # max() keeps the first of equal values, in the greedy agent's action order
+            best = actions[max(range(len(actions)), key=values.__getitem__)]
+        self.stats["decisions"] += 1
+        self.stats["depth_total"] += depth
+        return best
+
+
+if __name__ == "__main__":
+    from functools import partial
+
+    from delivery_eval import evaluate
+    from lab1 import WorldState
+
+    # Walking towards the target is penalized: the greedy agent turns away
+    # from the package and stalls against the world bound
+    rewards = {"CLOSER_BONUS": -3}
+    world = WorldState(package_loc=3, delivery_loc=6)
+    for agent in (UtilityBasedDeliveryAgent(), LookaheadDeliveryAgent()):
+        for name, value in rewards.items():
+            setattr(agent, name, value)
+        agent.position = 5
+        agent.perceive(world)
+        actions = []
+        while not agent.package_delivered and len(actions) < 12:
+            actions.append(agent.act()[0])
+        print(f"{type(agent).__name__}: {' '.join(actions)}")
+
+    print("\nagent                      success   mean steps   episodes/s")
+    cases = [("greedy", UtilityBasedDeliveryAgent)]
+    for depth in (2, 8, 30):
+        cases.append((f"lookahead, max depth {depth}", partial(LookaheadDeliveryAgent, max_depth=depth)))
+    for name, agent_class in cases:
+        summary = evaluate(2000, seed=1, chunk_size=500, rewards=rewards, agent_class=agent_class)
+        print(f"{name:<26}{summary['success_rate']:>8.1%}{summary['mean_steps']:>13.2f}"
+              f"{summary['episodes_per_second']:>13,.0f}")
+
+    # Latency: the time budget caps every decision
+    agent = LookaheadDeliveryAgent(max_depth=200, time_budget=0.002, slip=0.2, table_size=1 << 12)
+    agent.position = 0
+    agent.perceive(WorldState(package_loc=9, delivery_loc=1))
+    slowest = 0.0
+    for _ in range(10):
+        start = time.perf_counter()
+        agent.act()
+        slowest = max(slowest, time.perf_counter() - start)
+    stats = agent.stats
+    print(f"\nslip 0.2, 2 ms budget: slowest decision {slowest * 1000:.2f} ms, "
+          f"mean depth {stats['depth_total'] / stats['decisions']:.1f}, {stats['timeouts']} timeouts, "
+          f"{stats['nodes']} nodes, {stats['table_hits']} table hits")
@@ -0,0 +1,331 @@
+import heapq
+import random
+import time
+
+from lab1 import UtilityBasedDeliveryAgent, WorldState
+
+INF = float("inf")
+
+
+# --- A delivery world that can change while the agent is running ---
+# Cells are the integer positions between the world bounds (the same
+# line the UtilityBasedDeliveryAgent walks on).  Cells can be blocked,
+# and the package / delivery locations can be moved.  Every edit is
+# appended to a change log and bumps the world's version, so any number of
+# planners can each keep their own cursor and ask "what changed since
+# version v?" without consuming the edits for the others.
+
+class DynamicWorldState(WorldState):
+    def __init__(self, package_loc, delivery_loc, bounds=(0, 10), blocked=()):
+        super().__init__(package_loc, delivery_loc)
+        self.bounds = bounds
+        self.blocked = set(blocked)
+        self._change_log = []  # Edited cells; the version is the log length
+
+    def is_blocked(self, cell):
+        """A cell is blocked if it is outside the world or marked blocked."""
+        low, high = self.bounds
+        return cell < low or cell > high or cell in self.blocked
+
+    def block(self, cell):
+        if cell not in self.blocked:
+            self.blocked.add(cell)
+            self._change_log.append(cell)
+
+    def unblock(self, cell):
+        if cell in self.blocked:
+            self.blocked.discard(cell)
+            self._change_log.append(cell)
+
+    def move_package(self, cell):
+        if cell != self.package_location:
+            self._change_log.extend((self.package_location, cell))
+            self.package_location = cell
+
+    def move_delivery(self, cell):
+        if cell != self.delivery_location:
+            self._change_log.extend((self.delivery_location, cell))
+            self.delivery_location = cell
+
+    @property
+    def version(self):
+        return len(self._change_log)
+
+    def changes_since(self, version):
+        """Returns (cells edited after `version`, current version)."""
+        return set(self._change_log[version:]), self.version
+
+    def neighbors(self, cell):
+        return (cell - 1, cell + 1)
+
+    def distance(self, a, b):
+        return abs(a - b)
+
+
+# On a single line every obstacle between the agent and its goal cuts
+# them apart, so the planner is also usable on a 2D floor plan where
+# obstacles can be walked around.  Cells are (x, y) tuples.
+
+class GridWorldState(DynamicWorldState):
+    def __init__(self, package_loc, delivery_loc, width, height, blocked=()):
+        super().__init__(package_loc, delivery_loc, ((0, 0), (width - 1, height - 1)), blocked)
+
+    def is_blocked(self, cell):
+        (low_x, low_y), (high_x, high_y) = self.bounds
+        x, y = cell
+        return (x < low_x or x > high_x or y < low_y or y > high_y or
+                cell in self.blocked)
+
+    def neighbors(self, cell):
+        x, y = cell
+        return ((x - 1, y), (x + 1, y), (x, y - 1), (x, y + 1))
+
+    def distance(self, a, b):
+        return abs(a[0] - b[0]) + abs(a[1] - b[1])
+
+
+# --- Incremental planner (D* Lite) ---
+# The planner searches backwards from the goal, so the cost-to-go values
+# (g / rhs) stay valid while the agent walks.  When cells change, only the
+# vertices around those cells are updated, and compute_shortest_path()
+# re-expands just the part of the search that the change made
+# inconsistent.  Moving the goal itself invalidates every cost-to-go value,
+# so in that case the planner starts over (still focused by the heuristic).
+
+class IncrementalPlanner:
+    def __init__(self, world, goal, start):
+        self.world = world
+        self.expansions = 0  # total vertex expansions, for benchmarking
+        self._reset(goal, start)
+
+    def _reset(self, goal, start):
+        self.goal = goal
+        self.start = start
+        self._last_start = start
+        self.km = 0
+        self.g = {}
+        self.rhs = {goal: 0}
+        self._open = {}
+        self._heap = []
+        self._push(goal)
+
+    def _h(self, a, b):
+        return self.world.distance(a, b)
+
+    def _cost(self, a, b):
+        if self.world.is_blocked(a) or self.world.is_blocked(b):
+            return INF
+        return 1
+
+    def _neighbors(self, cell):
+        return self.world.neighbors(cell)
+
+    def _calculate_key(self, cell):
+        best = min(self.g.get(cell, INF), self.rhs.get(cell, INF))
+        return (best + self._h(self.start, cell) + self.km, best)
+
+    def _push(self, cell):
+        key = self._calculate_key(cell)
+        self._open[cell] = key
+        heapq.heappush(self._heap, (key, cell))
+
+    def _top_key(self):
+        # Entries are removed lazily: skip the ones that were superseded.
+        while self._heap:
+            key, cell = self._heap[0]
+            if self._open.get(cell) == key:
+                return key
+            heapq.heappop(self._heap)
+        return (INF, INF)
+
+    def _update_vertex(self, cell):
+        if cell != self.goal:
+            self.rhs[cell] = min(self._cost(cell, n) + self.g.get(n, INF)
+                                 for n in self._neighbors(cell))
+        self._open.pop(cell, None)
+        if self.g.get(cell, INF) != self.rhs.get(cell, INF):
+            self._push(cell)
+
+    def compute_shortest_path(self):
+        """Re-expands inconsistent vertices until the start is consistent."""
+        while (self._top_key() < self._calculate_key(self.start) or
+               self.rhs.get(self.start, INF) != self.g.get(self.start, INF)):
+            key_old, cell = heapq.heappop(self._heap)
+            del self._open[cell]
+            self.expansions += 1
+
+            key_new = self._calculate_key(cell)
+            g_cell = self.g.get(cell, INF)
+            rhs_cell = self.rhs.get(cell, INF)
+            if key_old < key_new:
+                self._push(cell)
+            elif g_cell > rhs_cell:
+                self.g[cell] = rhs_cell
+                for n in self._neighbors(cell):
+                    self._update_vertex(n)
+            else:
+                self.g[cell] = INF
+                self._update_vertex(cell)
+                for n in self._neighbors(cell):
+                    self._update_vertex(n)
+
+            if key_old == (INF, INF):
+                break  # Everything left is unreachable
+
+    def replan(self, start, changed_cells=(), goal=None):
+        """Moves the start, applies edited cells and repairs the plan."""
+        if goal is not None and goal != self.goal:
+            self._reset(goal, start)
+        else:
+            self.start = start
+            self.km += self._h(self._last_start, start)
+            self._last_start = start
+            for cell in changed_cells:
+                self._update_vertex(cell)
+                for n in self._neighbors(cell):
+                    self._update_vertex(n)
+        self.compute_shortest_path()
+
+    def cost_to_go(self, cell=None):
+        """Current cost-to-go estimate (INF when the goal is unreachable)."""
+        return self.g.get(self.start if cell is None else cell, INF)
+
+    def next_step(self):
+        """Returns the neighbour of the start that lies on a shortest path."""
+        if self.start == self.goal or self.cost_to_go() == INF:
+            return None
+        return min(self._neighbors(self.start),
+                   key=lambda n: self._cost(self.start, n) + self.g.get(n, INF))
+
+
+# --- Delivery agent that follows the incremental planner ---
+
+def _move_name(cell, step):
+    """Action name of a one-cell move, on the line or on a grid."""
+    if isinstance(cell, tuple):
+        dx, dy = step[0] - cell[0], step[1] - cell[1]
+        if dx:
+            return "move_left" if dx < 0 else "move_right"
+        return "move_down" if dy < 0 else "move_up"
+    return "move_left" if step < cell else "move_right"
+
+
+class ReplanningDeliveryAgent(UtilityBasedDeliveryAgent):
+    def __init__(self):
+        super().__init__()
+        self.planner = None
+        self._world_version = 0  # Our cursor into the world's change log
+
+    def perceive(self, world_state):
+        """Perceive the environment and repair the plan for what changed"""
+        super().perceive(world_state)
+        goal = self._current_goal()
+        if self.planner is None or self.planner.world is not world_state:
+            self._world_version = world_state.version
+            self.planner = IncrementalPlanner(world_state, goal, self.position)
+            self.planner.compute_shortest_path()
+        else:
+            changed, self._world_version = world_state.changes_since(self._world_version)
+            self.planner.replan(self.position, changed, goal)
+
+    def _current_goal(self):
+        if self.has_package:
+            return self.world.delivery_location
+        return self.world.package_location
+
+    def act(self):
+        """Pick up / deliver when possible, otherwise follow the plan"""
+        if self.position == self.world.package_location and not self.has_package:
+            utility = self._utility_pickup()
+            self.has_package = True
+            return "pickup_package", utility
+        if self.position == self.world.delivery_location and self.has_package:
+            self.has_package = False
+            self.package_delivered = True
+            return "package_delivered", self.DELIVERY_REWARD
+
+        self.perceive(self.world)  # the goal may have switched after a pickup
+        step = self.planner.next_step()
+        if step is None:
+            return "wait", self.WAIT_UTILITY
+        action = _move_name(self.position, step)
+        self.position = step
+        return action, -self.MOVE_COST
+
+
+# --- Benchmark: incremental repair vs. planning from scratch ---
+
+def benchmark_random_edits(width=60, height=60, obstacles_per_tick=5, lifetime=25, seed=0):
+    """
+    Walks an agent across a large floor while random cells are blocked for
+    a few ticks at a time, and compares the work done by the incremental
+    planner against building a fresh planner on every tick.
+    """
+    rng = random.Random(seed)
+    world = GridWorldState(package_loc=(width - 1, height - 1), delivery_loc=(0, 0),
+                           width=width, height=height)
+    position = (0, 0)
+    expires = {}
+
+    incremental = IncrementalPlanner(world, world.package_location, position)
+    version = world.version
+    incremental.compute_shortest_path()
+    incremental_expansions = incremental_time = 0
+    scratch_expansions = scratch_time = 0
+
+    ticks = 0
+    while position != world.package_location:
+        ticks += 1
+        for cell in [c for c, tick in expires.items() if tick == ticks]:
+            del expires[cell]
+            world.unblock(cell)
+        for _ in range(obstacles_per_tick):
+            cell = (rng.randrange(width), rng.randrange(height))
+            if cell not in (position, world.package_location) and cell not in expires:
+                expires[cell] = ticks + lifetime
+                world.block(cell)
+        changed, version = world.changes_since(version)
+
+        before = incremental.expansions
+        t0 = time.perf_counter()
+        incremental.replan(position, changed)
+        incremental_time += time.perf_counter() - t0
+        incremental_expansions += incremental.expansions - before
+
+        t0 = time.perf_counter()
+        fresh = IncrementalPlanner(world, world.package_location, position)
+        fresh.compute_shortest_path()
+        scratch_time += time.perf_counter() - t0
+        scratch_expansions += fresh.expansions
+
+        assert fresh.cost_to_go() == incremental.cost_to_go()
+        step = incremental.next_step()
+        if step is not None:
+            position = step
+
+    print(f"World: {width}x{height}, ticks: {ticks}, obstacles/tick: {obstacles_per_tick}")
+    print(f"Incremental: {incremental_expansions} expansions, {incremental_time * 1000:.1f} ms")
+    print(f"From scratch: {scratch_expansions} expansions, {scratch_time * 1000:.1f} ms")
+    return incremental_expansions, scratch_expansions
+
+
+if __name__ == "__main__":
+    print("=" * 50)
+    print("REPLANNING DELIVERY AGENT DEMONSTRATION")
+    world = DynamicWorldState(package_loc=3, delivery_loc=8, blocked={5})
+    agent = ReplanningDeliveryAgent()
+    agent.perceive(world)
+    for step in range(30):
+        if step == 4:
+            world.unblock(5)
+            world.move_delivery(6)
+            agent.perceive(world)
+        action, utility = agent.act()
+        print(f"Step {step + 1}: Pos={agent.position}, Action={action}, HasPackage={agent.has_package}")
+        if agent.package_delivered:
+            print("Package delivered successfully!")
+            break
+
+    print("\n" + "=" * 50)
+    print("BENCHMARK: RANDOM WORLD EDITS")
+    benchmark_random_edits()
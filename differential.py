@@ -0,0 +1,247 @@
+import argparse
+import io
+import json
+import math
+import random
+import sys
+import time
+from collections import defaultdict
+from contextlib import redirect_stdout
+
+import lab2
+import Marya_lab2
+import main
+from lab1 import RiverProblemSolvingAgent
+from mc_puzzle import MissionariesCannibalsPuzzle
+from move_tables import move_table
+from pattern_db import PatternDatabase
+from river_puzzle import RiverPuzzle
+from search import STRATEGIES, astar, bounded_bfs
+from state_graph import CSRGraph, enumerate_graph
+from state_labels import encode_state
+from state_ranking import ranked_bfs
+from symmetry import SymmetricRiverPuzzle
+
+
+# --- Differential harness for the duplicate solvers ---
+# Every solver in the repo runs on the same puzzles and its answer is
+# translated into the generalized puzzle's states (river: bitmask ints,
+# M&C: (m_left, c_left, boat) with boat 0 on the left, as in lab2.py).
+# An answer is accepted when it is a valid path from start to goal with
+# the same number of steps as the reference (the first engine), or when
+# both agree that there is no solution.  Timings are reported as ratios to
+# the reference, so a new engine can be adopted once it agrees everywhere.
+#
+# The lab scripts only know their own puzzle: lab1.py, main.py and
+# Marya_lab2.py run on the classic configuration only; lab2.py reads its
+# sizes from module globals, so it also runs on generalized M&C puzzles
+# without boat rules.
+
+class Engine:
+    def __init__(self, name, kind, solve, supports=None):
+        self.name = name
+        self.kind = kind
+        self.solve = solve
+        self.supports = supports or (lambda puzzle: True)
+
+
+def _csr_solve(puzzle):
+    codes, indptr, indices = enumerate_graph(puzzle.START_STATE, puzzle.next_states, puzzle.encode)
+    graph = CSRGraph(indptr, indices, codes)
+    goal = puzzle.encode(puzzle.GOAL_STATE)
+    if goal not in {int(code) for code in codes}:
+        return None
+    path = graph.shortest_path(0, graph.state_id(goal))
+    return [puzzle.decode(int(codes[i])) for i in path]
+
+
+def _is_classic(puzzle):
+    return puzzle.spec() == type(puzzle)().spec()
+
+
+def _lab1_solve(puzzle):
+    path = RiverProblemSolvingAgent().solve()
+    return [encode_state(state) for state in path] if path else None
+
+
+def _main_solve(puzzle):
+    path = main.solve_river_problem()
+    return [encode_state(state) for state in path] if path else None
+
+
+def _state_chain(goal):
+    path = []
+    while goal is not None:
+        path.append(goal)
+        goal = goal.parent
+    path.reverse()
+    return path
+
+
+def _lab2_solve(puzzle):
+    saved = lab2.TOTAL_M, lab2.TOTAL_C, lab2.MOVES
+    lab2.TOTAL_M, lab2.TOTAL_C, lab2.MOVES = puzzle.total_m, puzzle.total_c, move_table(puzzle.boat_capacity)
+    try:
+        goal = lab2.solve_bfs()
+    finally:
+        lab2.TOTAL_M, lab2.TOTAL_C, lab2.MOVES = saved
+    if goal is None:
+        return None
+    return [(s.missionaries, s.cannibals, s.boat) for s in _state_chain(goal)]
+
+
+def _marya_solve(puzzle):
+    goal = Marya_lab2.solve_bfs()
+    if goal is None:
+        return None
+    # Marya_lab2.py uses 1 for the left bank
+    return [(s.missionaries, s.cannibals, 1 - s.boat) for s in _state_chain(goal)]
+
+
+def _strategy(name):
+    return lambda puzzle: STRATEGIES[name](puzzle)
+
+
+ENGINES = [
+    Engine("RiverPuzzle.solve", "river", lambda puzzle: puzzle.solve()),
+    Engine("search.bidirectional", "river", _strategy("bidirectional")),
+    Engine("search.astar", "river", _strategy("astar")),
+    Engine("astar + pattern_db", "river", lambda puzzle: astar(puzzle, PatternDatabase(puzzle))),
+    Engine("bounded_bfs", "river", lambda puzzle: bounded_bfs(puzzle).path),
+    Engine("symmetry", "river", lambda puzzle: SymmetricRiverPuzzle(puzzle).solve()),
+    Engine("state_graph CSR", "river", _csr_solve),
+    Engine("lab1.py", "river", _lab1_solve, _is_classic),
+    Engine("main.py", "river", _main_solve, _is_classic),
+
+    Engine("MissionariesCannibalsPuzzle.solve", "mc", lambda puzzle: puzzle.solve()),
+    Engine("search.bidirectional", "mc", _strategy("bidirectional")),
+    Engine("search.astar", "mc", _strategy("astar")),
+    Engine("bounded_bfs", "mc", lambda puzzle: bounded_bfs(puzzle).path),
+    Engine("state_graph CSR", "mc", _csr_solve),
+    Engine("ranked_bfs", "mc", lambda puzzle: ranked_bfs(puzzle, puzzle.ranker)),
+    Engine("lab2.py", "mc", _lab2_solve, lambda puzzle: not puzzle.boat_rules),
+    Engine("Marya_lab2.py", "mc", _marya_solve, _is_classic),
+]
+
+
+def random_puzzles(count, seed=0):
+    """The classic puzzles followed by `count` random generalized ones."""
+    rng = random.Random(seed)
+    puzzles = [RiverPuzzle(), MissionariesCannibalsPuzzle()]
+    for i in range(count):
+        if i % 2 == 0:
+            items = [f"Item{j}" for j in range(rng.randint(2, 9))]
+            pairs = [(a, b) for a in items for b in items if a != b]
+            eats = rng.sample(pairs, rng.randint(0, min(len(pairs), len(items))))
+            puzzles.append(RiverPuzzle(items=items, eats=eats, boat_capacity=rng.randint(1, 3)))
+        else:
+            rules = ("missionaries_not_outnumbered",) if rng.random() < 0.25 else ()
+            puzzles.append(MissionariesCannibalsPuzzle(missionaries=rng.randint(1, 15),
+                                                       cannibals=rng.randint(1, 15),
+                                                       boat_capacity=rng.randint(1, 5),
+                                                       boat_rules=rules))
+    return puzzles
+
+
+def check_path(puzzle, path):
+    """Returns None if path is a valid solution, else what is wrong with it."""
+    if path[0] != puzzle.START_STATE:
+        return f"starts at {path[0]!r}"
+    if path[-1] != puzzle.GOAL_STATE:
+        return f"ends at {path[-1]!r}"
+    for i, (prev, curr) in enumerate(zip(path, path[1:]), 1):
+        if curr not in puzzle.next_states(prev):
+            return f"step {i} ({prev!r} -> {curr!r}) is not a legal move"
+    return None
+
+
+def compare(puzzle, engines=None, repeat=1):
+    """Runs every supporting engine on one puzzle; returns a list of records."""
+    kind = puzzle.spec()["type"]
+    engines = [e for e in (engines or ENGINES) if e.kind == kind and e.supports(puzzle)]
+    records = []
+    reference = None
+    for engine in engines:
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            path = engine.solve(puzzle)
+            timings.append(time.perf_counter() - start)
+        record = {"engine": engine.name, "spec": puzzle.spec(), "elapsed": min(timings),
+                  "steps": len(path) - 1 if path else None, "error": None}
+        if path:
+            record["error"] = check_path(puzzle, path)
+        if reference is None:
+            reference = record
+        elif record["steps"] != reference["steps"]:
+            record["error"] = f"{record['steps']} steps, reference {reference['engine']} found {reference['steps']}"
+        record["ratio"] = record["elapsed"] / max(reference["elapsed"], 1e-9)
+        records.append(record)
+    return records
+
+
+def run_differential(puzzles, engines=None, repeat=1, log_path=None):
+    """Compares all engines on every puzzle; returns the list of records."""
+    records = []
+    log = open(log_path, "w", encoding="utf-8") if log_path else None
+    try:
+        for puzzle in puzzles:
+            for record in compare(puzzle, engines, repeat):
+                records.append(record)
+                if log is not None:
+                    log.write(json.dumps(record) + "\n")
+    finally:
+        if log is not None:
+            log.close()
+    return records
+
+
+def check_budget_printout(module):
+    """
+    print_solution() of the goal found by solve_bfs_with_budget() prints
+    the same as for solve_bfs(); returns an error message or None.
+    """
+    outputs = []
+    for goal in (module.solve_bfs(), module.solve_bfs_with_budget().path[-1]):
+        buffer = io.StringIO()
+        with redirect_stdout(buffer):
+            module.print_solution(goal)
+        outputs.append(buffer.getvalue())
+    if outputs[0] != outputs[1]:
+        return f"{module.__name__}: print_solution() differs for the solve_bfs_with_budget() goal"
+    return None
+
+
+def summarize(records):
+    """Per (kind, engine): runs, mismatches and the geometric mean time ratio."""
+    groups = defaultdict(list)
+    for record in records:
+        groups[(record["spec"]["type"], record["engine"])].append(record)
+    summary = []
+    for (kind, name), group in groups.items():
+        log_ratio = sum(math.log(max(r["ratio"], 1e-9)) for r in group) / len(group)
+        summary.append({"kind": kind, "engine": name, "runs": len(group),
+                        "mismatches": sum(r["error"] is not None for r in group),
+                        "ratio": math.exp(log_ratio)})
+    return summary
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Cross-check every solver implementation")
+    parser.add_argument("--count", type=int, default=200, help="random puzzles besides the classic ones")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=1, help="timed runs per engine (fastest is kept)")
+    parser.add_argument("--log", default=None, help="write every record to this NDJSON file")
+    args = parser.parse_args()
+
+    records = run_differential(random_puzzles(args.count, args.seed), repeat=args.repeat, log_path=args.log)
+    print(f"{'kind':<6}{'engine':<36}{'runs':>6}{'mismatches':>12}{'time ratio':>12}")
+    for row in summarize(records):
+        print(f"{row['kind']:<6}{row['engine']:<36}{row['runs']:>6}{row['mismatches']:>12}{row['ratio']:>12.2f}")
+    failures = [r for r in records if r["error"]]
+    for record in failures[:10]:
+        print(f"MISMATCH {record['engine']} on {json.dumps(record['spec'])}: {record['error']}")
+    printout_errors = [error for error in map(check_budget_printout, (lab2, Marya_lab2)) if error]
+    for error in printout_errors:
+        print(f"MISMATCH {error}")
+    sys.exit(1 if failures or printout_errors else 0)
@@ -0,0 +1,293 @@
+import heapq
+import random
+import time
+
+
+# --- Many agents and packages in one world ---
+# Cells are (x, y) tuples and distances are Manhattan, like GridWorldState
+# in delivery_planner.py.  Scanning every waiting package for every idle
+# agent costs O(agents x packages) per tick; instead the waiting pickups are
+# kept in a GridIndex (a dict of square buckets), and a nearest-package
+# query only looks at the rings of buckets around the agent until nothing
+# closer can remain.  With about one package per bucket a query costs O(1)
+# buckets on average, so a tick costs about O(agents + packages).  When
+# the packages are sparse the rings would mostly be empty, so once a query
+# has probed as many ring cells as there are buckets it scans the buckets
+# directly instead.
+#
+# Assignment, every tick, of idle agents to waiting packages:
+#   "sequential"  each idle agent in turn takes its nearest free package
+#                 (ties by package id), exactly what the full scan does;
+#   "batched"     candidate pairs to each agent's k nearest packages are
+#                 matched shortest first, and agents left without a
+#                 candidate fall back to "sequential".  Closer to a global
+#                 greedy matching, so the total distance is lower.
+
+
+def manhattan(a, b):
+    return abs(a[0] - b[0]) + abs(a[1] - b[1])
+
+
+class GridIndex:
+    """Points bucketed in square cells of side cell_size, for nearest queries."""
+
+    def __init__(self, cell_size):
+        self.cell_size = cell_size
+        self.buckets = {}  # (bx, by) -> {item: point}
+        self.where = {}  # item -> bucket key
+        self.low = self.high = None  # Bucket coordinates spanned so far
+
+    def __len__(self):
+        return len(self.where)
+
+    def __contains__(self, item):
+        return item in self.where
+
+    def insert(self, item, point):
+        size = self.cell_size
+        key = (point[0] // size, point[1] // size)
+        self.buckets.setdefault(key, {})[item] = point
+        self.where[item] = key
+        if self.low is None:
+            self.low, self.high = key, key
+        else:
+            self.low = (min(self.low[0], key[0]), min(self.low[1], key[1]))
+            self.high = (max(self.high[0], key[0]), max(self.high[1], key[1]))
+
+    def remove(self, item):
+        key = self.where.pop(item)
+        bucket = self.buckets[key]
+        del bucket[item]
+        if not bucket:
+            del self.buckets[key]
+
+    def _ring(self, bx, by, r):
+        """Bucket keys at Chebyshev distance r from (bx, by)."""
+        if r == 0:
+            yield bx, by
+            return
+        for x in range(bx - r, bx + r + 1):
+            yield x, by - r
+            yield x, by + r
+        for y in range(by - r + 1, by + r):
+            yield bx - r, y
+            yield bx + r, y
+
+    def nearest(self, point, k=1):
+        """The k nearest items as sorted (distance, item) pairs."""
+        if not self.where:
+            return []
+        k = min(k, len(self.where))  # Otherwise every ring would be searched
+        size, buckets = self.cell_size, self.buckets
+        bx, by = point[0] // size, point[1] // size
+        # Beyond this ring no bucket holds anything
+        last = max(abs(bx - self.low[0]), abs(bx - self.high[0]), abs(by - self.low[1]), abs(by - self.high[1]))
+        best = []  # Max-heap of (-distance, -item) for the k best so far
+        px, py = point
+        probes = 0
+        for r in range(last + 1):
+            probes += 8 * r or 1
+            if probes > len(buckets):
+                # Sparse items: scanning every bucket is cheaper than more rings
+                return heapq.nsmallest(k, ((abs(x - px) + abs(y - py), item) for bucket in buckets.values()
+                                           for item, (x, y) in bucket.items()))
+            for key in self._ring(bx, by, r):
+                bucket = buckets.get(key)
+                if bucket is None:
+                    continue
+                for item, (x, y) in bucket.items():
+                    entry = (-(abs(x - px) + abs(y - py)), -item)
+                    if len(best) < k:
+                        heapq.heappush(best, entry)
+                    elif entry > best[0]:
+                        heapq.heapreplace(best, entry)
+            # Anything in ring r + 1 or further is at least r * size + 1 away
+            if len(best) == k and -best[0][0] <= r * size:
+                break
+        return sorted((-distance, -item) for distance, item in best)
+
+
+# --- Assignment ---
+
+def assign_sequential(agents, index):
+    """
+    Gives each idle agent, in order, its nearest package in the index.
+    agents is a list of (agent, cell).  Assigned packages are removed from
+    the index.  Returns {agent: package}.
+    """
+    assignment = {}
+    for agent, cell in agents:
+        found = index.nearest(cell)
+        if not found:
+            break
+        package = found[0][1]
+        index.remove(package)
+        assignment[agent] = package
+    return assignment
+
+
+def assign_batched(agents, index, k=4):
+    """Like assign_sequential, but matches the shortest candidate pairs first."""
+    pairs = []
+    for agent, cell in agents:
+        for distance, package in index.nearest(cell, k):
+            pairs.append((distance, agent, package))
+    pairs.sort()
+    assignment = {}
+    for distance, agent, package in pairs:
+        if agent not in assignment and package in index:
+            index.remove(package)
+            assignment[agent] = package
+    # Every candidate of these agents was taken by a closer pair
+    left = [(agent, cell) for agent, cell in agents if agent not in assignment]
+    assignment.update(assign_sequential(left, index))
+    return assignment
+
+
+def assign_scan(agents, points):
+    """Reference: each idle agent scans every waiting package.  O(agents x packages)."""
+    waiting = set(points)
+    assignment = {}
+    for agent, cell in agents:
+        if not waiting:
+            break
+        package = min(waiting, key=lambda p: (manhattan(cell, points[p]), p))
+        waiting.discard(package)
+        assignment[agent] = package
+    return assignment
+
+
+ASSIGNERS = {"sequential": assign_sequential, "batched": assign_batched}
+
+
+# --- Shared world ---
+
+class FleetWorldState:
+    """
+    Agents and (pickup, delivery) packages on a width x height grid.  An
+    agent carries one package at a time: it walks to the pickup, then to
+    the delivery, one cell per tick, and is then free again.
+    """
+
+    def __init__(self, width, height, agent_cells, cell_size=None, assignment="batched"):
+        self.width, self.height = width, height
+        self.positions = list(agent_cells)
+        self.jobs = [None] * len(self.positions)  # Agent -> (package, carrying)
+        self.packages = {}  # Package -> (pickup, delivery), until delivered
+        self.next_package = 0
+        self.delivered = 0
+        if cell_size is None:
+            # About one agent per bucket
+            cell_size = max(1, int((width * height / max(1, len(self.positions))) ** 0.5))
+        self.index = GridIndex(cell_size)
+        self.assign = ASSIGNERS[assignment]
+        self.tick_count = 0
+        self.last_assigned = 0
+
+    def add_package(self, pickup, delivery):
+        package = self.next_package
+        self.next_package += 1
+        self.packages[package] = (pickup, delivery)
+        self.index.insert(package, pickup)
+        return package
+
+    def tick(self):
+        """Assigns idle agents, then moves every busy agent one cell."""
+        self.tick_count += 1
+        idle = [(agent, self.positions[agent]) for agent, job in enumerate(self.jobs) if job is None]
+        assignment = self.assign(idle, self.index)
+        for agent, package in assignment.items():
+            self.jobs[agent] = (package, False)
+        self.last_assigned = len(assignment)
+
+        positions, jobs, packages = self.positions, self.jobs, self.packages
+        for agent, job in enumerate(jobs):
+            if job is None:
+                continue
+            package, carrying = job
+            x, y = positions[agent]
+            tx, ty = packages[package][1 if carrying else 0]
+            if x != tx:
+                positions[agent] = (x + (1 if tx > x else -1), y)
+            elif y != ty:
+                positions[agent] = (x, y + (1 if ty > y else -1))
+            elif not carrying:
+                jobs[agent] = (package, True)  # Picked up
+            else:
+                jobs[agent] = None  # Delivered
+                del packages[package]
+                self.delivered += 1
+
+
+def random_cell(rng, width, height):
+    return rng.randrange(width), rng.randrange(height)
+
+
+def random_fleet(count, width, height, seed=0, assignment="batched"):
+    rng = random.Random(seed)
+    world = FleetWorldState(width, height, [random_cell(rng, width, height) for _ in range(count)],
+                            assignment=assignment)
+    for _ in range(count):
+        world.add_package(random_cell(rng, width, height), random_cell(rng, width, height))
+    return world, rng
+
+
+if __name__ == "__main__":
+    # One assignment round: every agent idle, as many packages as agents
+    print("agents = packages   full scan      sequential       batched     (assigned distance)")
+    for count in (1000, 2000, 4000, 10000):
+        side = int((count * 100) ** 0.5)  # Keep the density constant
+        timings, totals, assignments = [], [], []
+        for method in ("scan", "sequential", "batched"):
+            if method == "scan" and count > 4000:
+                timings.append(None)
+                totals.append(None)
+                assignments.append(None)
+                continue
+            world, _ = random_fleet(count, side, side, seed=count)
+            idle = list(enumerate(world.positions))
+            pickups = {package: cells[0] for package, cells in world.packages.items()}
+            start = time.perf_counter()
+            if method == "scan":
+                assignment = assign_scan(idle, pickups)
+            else:
+                assignment = ASSIGNERS[method](idle, world.index)
+            timings.append(time.perf_counter() - start)
+            totals.append(sum(manhattan(world.positions[a], pickups[p]) for a, p in assignment.items()))
+            assignments.append(assignment)
+        if assignments[0] is not None:
+            assert assignments[1] == assignments[0]  # Same nearest choices as the full scan
+        cells = [f"{t * 1000:>9.1f} ms" if t is not None else f"{'(skipped)':>12}" for t in timings]
+        print(f"{count:>16}  {cells[0]}  {cells[1]}  {cells[2]}     "
+              f"({' / '.join('-' if total is None else str(total) for total in totals)})")
+
+    # Few packages, many agents: every query falls back to scanning the buckets
+    side = int((4000 * 100) ** 0.5)
+    rng = random.Random(2)
+    idle = [(agent, random_cell(rng, side, side)) for agent in range(4000)]
+    pickups = [random_cell(rng, side, side) for _ in range(3)]
+    timings = []
+    for method in ("sequential", "batched"):
+        index = GridIndex(10)  # About one agent per bucket
+        for package, cell in enumerate(pickups):
+            index.insert(package, cell)
+        start = time.perf_counter()
+        assert len(ASSIGNERS[method](idle, index)) == 3
+        timings.append(time.perf_counter() - start)
+    print(f"\n4000 agents, 3 packages: sequential {timings[0] * 1000:.1f} ms, batched {timings[1] * 1000:.1f} ms")
+    assert timings[1] < 1.0  # Searching every ring for k = 4 candidates took seconds
+
+    # A running fleet: 10^4 agents, 10^4 waiting packages, more arriving every tick
+    count = 10000
+    side = int((count * 100) ** 0.5)
+    world, rng = random_fleet(count, side, side, seed=1)
+    tick_times = []
+    for _ in range(50):
+        for _ in range(200):
+            world.add_package(random_cell(rng, side, side), random_cell(rng, side, side))
+        start = time.perf_counter()
+        world.tick()
+        tick_times.append(time.perf_counter() - start)
+    print(f"\n{count} agents on {side}x{side}, 50 ticks: mean tick {sum(tick_times) / len(tick_times) * 1000:.1f} ms, "
+          f"slowest {max(tick_times) * 1000:.1f} ms, {world.delivered} delivered, "
+          f"{len(world.index)} packages waiting")
@@ -0,0 +1,239 @@
+import heapq
+from itertools import count
+
+from river_puzzle import RiverPuzzle
+
+
+# --- Incremental re-solve after a constraint change ---
+# The solver keeps a label per state: a lower bound on its distance to the
+# goal that is also consistent (it drops by at most 1 per move).  relabel()
+# makes the labels exact with one BFS from the goal (crossings are
+# reversible); states without a label cannot reach the goal.  solve() is
+# an A* search from the start over max(label, puzzle.heuristic), which is
+# consistent as well, with ties broken towards the deeper state: with exact
+# labels it walks straight down a shortest path.  Afterwards every state
+# it expanded is labelled cost - depth (Adaptive A*), which keeps the
+# labels consistent lower bounds and makes the next search cheaper.
+#
+# A rule change only repairs what it touches:
+#   - removing states or moves (a new eats rule, a smaller boat) can only
+#     lengthen paths, so the labels stay lower bounds; the states that
+#     became invalid just lose theirs, and the next search is focused on
+#     the start instead of relabelling everything;
+#   - adding states or moves (dropping a rule) can shorten paths: the new
+#     states are labelled from their neighbours and lower labels spread
+#     Dijkstra-style, only as far as they change anything;
+#   - a bigger boat adds moves from nearly every state, so the labels are
+#     rebuilt.
+
+INFINITY = float("inf")
+
+
+class IncrementalSolver:
+    def __init__(self, puzzle):
+        self.start = puzzle.START_STATE
+        self.relabel(puzzle)
+
+    def relabel(self, puzzle):
+        """Labels every state exactly, from scratch (one BFS from the goal)."""
+        self.puzzle = puzzle
+        self.distance = {}
+        goal = puzzle.GOAL_STATE
+        if puzzle.is_valid(goal):
+            self.distance[goal] = 0
+            layer = [goal]
+            depth = 0
+            while layer:
+                depth += 1
+                next_layer = []
+                for state in layer:
+                    for next_state in puzzle.next_states(state):
+                        if next_state not in self.distance:
+                            self.distance[next_state] = depth
+                            next_layer.append(next_state)
+                layer = next_layer
+        self.stats = {"relabeled": len(self.distance), "invalidated": 0, "expanded": 0}
+
+    def solve(self, start=None):
+        """Shortest path from start (default: the current start) to the goal, or None."""
+        state = self.start if start is None else start
+        puzzle, distance = self.puzzle, self.distance
+        goal, heuristic = puzzle.GOAL_STATE, puzzle.heuristic
+        if state not in distance or not puzzle.is_valid(state):
+            return None
+        depth = {state: 0}
+        parents = {state: None}
+        expanded = []
+        tie = count()
+        heap = [(max(distance[state], heuristic(state)), 0, next(tie), state)]
+        while heap:
+            _, negative_depth, _, state = heapq.heappop(heap)
+            if -negative_depth > depth[state]:
+                continue  # A shorter route to this state was found later
+            if state == goal:
+                break
+            expanded.append(state)
+            next_depth = depth[state] + 1
+            for next_state in puzzle.next_states(state):
+                label = distance.get(next_state)
+                if label is None or next_depth >= depth.get(next_state, INFINITY):
+                    continue
+                depth[next_state] = next_depth
+                parents[next_state] = state
+                heapq.heappush(heap, (next_depth + max(label, heuristic(next_state)), -next_depth,
+                                      next(tie), next_state))
+        else:
+            # No path: nothing the search reached can get to the goal
+            for state in expanded:
+                del distance[state]
+            self.stats["expanded"] += len(expanded)
+            return None
+
+        cost = depth[goal]
+        for state in expanded:
+            distance[state] = max(distance[state], cost - depth[state])
+        self.stats["expanded"] += len(expanded)
+        path = []
+        state = goal
+        while state is not None:
+            path.append(state)
+            state = parents[state]
+        path.reverse()
+        return path
+
+    def move_start(self, start):
+        """The labels do not depend on the start, so nothing is repaired."""
+        self.start = start
+        self.stats = {"relabeled": 0, "invalidated": 0, "expanded": 0}
+        return self.solve()
+
+    def update(self, puzzle, removed=(), seeds=()):
+        """
+        Switches to a changed puzzle and repairs the labels.  removed are
+        states that are no longer valid, and seeds are states that may have
+        gained moves (or just became valid).  Moves that disappeared need
+        nothing: the labels stay lower bounds.
+        """
+        distance = self.distance
+        self.puzzle = puzzle
+        self.stats = {"relabeled": 0, "invalidated": 0, "expanded": 0}
+        for state in removed:
+            if distance.pop(state, None) is not None:
+                self.stats["invalidated"] += 1
+        if not puzzle.is_valid(puzzle.GOAL_STATE):
+            distance.clear()
+            return
+
+        # Lower labels outwards from the seeds, as far as they change anything
+        next_states = puzzle.next_states
+        heap = []
+        for state in seeds:
+            if not puzzle.is_valid(state):
+                continue
+            best = min((distance[n] for n in next_states(state) if n in distance), default=INFINITY)
+            if best + 1 < distance.get(state, INFINITY):
+                heapq.heappush(heap, (best + 1, state))
+        while heap:
+            label, state = heapq.heappop(heap)
+            if label >= distance.get(state, INFINITY):
+                continue
+            distance[state] = label
+            self.stats["relabeled"] += 1
+            for neighbor in next_states(state):
+                if label + 1 < distance.get(neighbor, INFINITY):
+                    heapq.heappush(heap, (label + 1, neighbor))
+
+
+class IncrementalRiverSolver(IncrementalSolver):
+    """IncrementalSolver with the usual edits of a RiverPuzzle."""
+
+    def _changed(self, eats=None, boat_capacity=None):
+        puzzle = self.puzzle
+        return RiverPuzzle(items=puzzle.items, eats=puzzle.eats if eats is None else eats,
+                           boat_capacity=puzzle.boat_capacity if boat_capacity is None else boat_capacity)
+
+    def _pair_alone_states(self, eater, eaten):
+        """The states with the pair on one bank and the farmer on the other."""
+        bits = {name: 1 << i for i, name in enumerate(self.puzzle.names)}
+        pair = bits[eater] | bits[eaten]
+        rests = [0]  # Every placement of the other items
+        for bit in bits.values():
+            if not bit & (pair | 1):
+                rests += [rest | bit for rest in rests]
+        for rest in rests:
+            yield rest | 1  # Pair South, farmer North
+            yield rest | pair  # Pair North, farmer South
+
+    def add_rule(self, eater, eaten):
+        """Adds an eats rule; only states where the pair is left alone change."""
+        puzzle = self._changed(eats=self.puzzle.eats + ((eater, eaten),))
+        distance = self.distance
+        removed = [state for state in self._pair_alone_states(eater, eaten)
+                   if state in distance and not puzzle.is_valid(state)]
+        self.update(puzzle, removed=removed)
+        return self.solve()
+
+    def remove_rule(self, eater, eaten):
+        """Drops an eats rule; the states it forbade become valid."""
+        old_puzzle = self.puzzle
+        puzzle = self._changed(eats=[pair for pair in old_puzzle.eats if pair != (eater, eaten)])
+        seeds = [state for state in self._pair_alone_states(eater, eaten)
+                 if puzzle.is_valid(state) and not old_puzzle.is_valid(state)]
+        self.update(puzzle, seeds=seeds)
+        return self.solve()
+
+    def set_capacity(self, boat_capacity):
+        """
+        A smaller boat only removes moves, so the labels stay lower bounds
+        and only the next search pays for the change.  A bigger one adds
+        moves from nearly every state, so the labels are rebuilt.
+        """
+        puzzle = self._changed(boat_capacity=boat_capacity)
+        if boat_capacity <= self.puzzle.boat_capacity:
+            self.update(puzzle)
+        else:
+            self.relabel(puzzle)
+        return self.solve()
+
+
+if __name__ == "__main__":
+    import time
+
+    items = [f"Item{i}" for i in range(17)]
+    base = RiverPuzzle(items=items, eats=[("Item0", "Item1"), ("Item1", "Item2")], boat_capacity=3)
+    t0 = time.perf_counter()
+    solver = IncrementalRiverSolver(base)
+    print(f"17 items: labelled {len(solver.distance)} states in {time.perf_counter() - t0:.2f} s, "
+          f"{len(solver.solve()) - 1} steps")
+
+    def full_solve(puzzle, start=None):
+        if start is not None:
+            puzzle.START_STATE = start
+        t0 = time.perf_counter()
+        path = puzzle.solve()
+        return path, time.perf_counter() - t0
+
+    edits = [
+        ("add eats rule Item5 -> Item6", lambda: solver.add_rule("Item5", "Item6"),
+         lambda: full_solve(RiverPuzzle(items, base.eats + (("Item5", "Item6"),), 3))),
+        ("remove eats rule Item5 -> Item6", lambda: solver.remove_rule("Item5", "Item6"),
+         lambda: full_solve(RiverPuzzle(items, base.eats, 3))),
+        ("move the start state", lambda: solver.move_start(0b1010),
+         lambda: full_solve(RiverPuzzle(items, base.eats, 3), start=0b1010)),
+        ("boat capacity 3 -> 2", lambda: solver.set_capacity(2),
+         lambda: full_solve(RiverPuzzle(items, base.eats, 2), start=0b1010)),
+    ]
+    timings = {}
+    for name, incremental, full in edits:
+        t0 = time.perf_counter()
+        path = incremental()
+        elapsed = time.perf_counter() - t0
+        full_path, full_elapsed = full()
+        assert (path is None) == (full_path is None) and (path is None or len(path) == len(full_path))
+        timings[name] = elapsed, full_elapsed
+        steps = f"{len(path) - 1} steps" if path else "no solution"
+        print(f"{name}: {steps}, incremental {elapsed:.2f} s "
+              f"({solver.stats['invalidated']} invalidated, {solver.stats['relabeled']} relabeled, "
+              f"{solver.stats['expanded']} expanded), full re-solve {full_elapsed:.2f} s")
+    elapsed, full_elapsed = timings["add eats rule Item5 -> Item6"]
+    assert elapsed < full_elapsed  # Repairing must beat starting over
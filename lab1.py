@@ -1,21 +1,91 @@
 
-from collections import deque
+import sys
+from collections import OrderedDict, deque
+
+from search import bounded_bfs
+from state_labels import StateLabelTable, encode_state
+from successors import iter_river_successors
+
+# Field names for TraceBuffer records written by the classes below
+AGENT_TRACE_FIELDS = ("step", "position", "action", "utility", "has_package")
+SOLUTION_TRACE_FIELDS = ("step", "state")
 
 
 # --- Agent 1: Utility-Based Agent (From User) ---
 # This agent is good for its original problem (delivery)
 # but is the WRONG tool for the river puzzle.
 
+class DecisionCache:
+    """
+    Bounded LRU cache of act() decisions.  One cache can be shared by many
+    agents in the same process, even agents in different worlds or with
+    different reward constants, because a decision only depends on the
+    (position, has_package, package_location, delivery_location, bounds,
+    rewards) key (see _decision_key()).
+    """
+
+    def __init__(self, max_size=4096):
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+
+    def get(self, key):
+        decision = self._entries.get(key)
+        if decision is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+            self._entries.move_to_end(key)
+        return decision
+
+    def put(self, key, decision):
+        self._entries[key] = decision
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)  # Drop the least recently used
+
+    def invalidate(self):
+        """Drops every entry, e.g. after the utility functions were changed."""
+        self._entries.clear()
+
+    def stats(self):
+        return {"hits": self.hits, "misses": self.misses, "size": len(self._entries)}
+
+
 class UtilityBasedDeliveryAgent:
-    def __init__(self):
+    # Reward constants of the utility functions.  They can be overridden on
+    # a subclass or an instance (see delivery_eval.py for tuning them).
+    INVALID_MOVE_UTILITY = -100
+    MOVE_COST = 1
+    DISTANCE_WEIGHT = 0.5
+    CLOSER_BONUS = 2
+    PICKUP_REWARD = 10
+    PICKUP_PENALTY = -10
+    DELIVERY_REWARD = 25
+    DELIVERY_PENALTY = -20
+    WAIT_UTILITY = -10
+    REWARD_NAMES = ("INVALID_MOVE_UTILITY", "MOVE_COST", "DISTANCE_WEIGHT", "CLOSER_BONUS",
+                    "PICKUP_REWARD", "PICKUP_PENALTY", "DELIVERY_REWARD", "DELIVERY_PENALTY",
+                    "WAIT_UTILITY")
+
+    def __init__(self, decision_cache=None, bounds=(0, 10)):
         self.position = 0
         self.has_package = False
         self.package_delivered = False
         self.world = None
+        self.bounds = bounds
+        self.decision_cache = decision_cache  # Optional shared DecisionCache
+        self._rewards_key = None  # Reward constants at the last perceive(), for the cache key
 
     def perceive(self, world_state):
         """Perceive the environment"""
         self.world = world_state
+        self._rewards_key = tuple(self.rewards().values())
+
+    def rewards(self):
+        """The current reward constants, as a {name: value} dict"""
+        return {name: getattr(self, name) for name in self.REWARD_NAMES}
 
     def calculate_utility(self, action):
         """Calculate utility for each possible action"""
@@ -24,7 +94,7 @@ class UtilityBasedDeliveryAgent:
             "move_right": self._utility_move(1),
             "pickup_package": self._utility_pickup(),
             "package_delivered": self._utility_deliver(),
-            "wait": -10  # Waiting is usually bad
+            "wait": self.WAIT_UTILITY  # Waiting is usually bad
         }
         return utilities.get(action, -100)  # Unknown actions have very low utility
 
@@ -33,25 +103,25 @@ class UtilityBasedDeliveryAgent:
         new_pos = self.position + direction
 
         # Check if move is valid
-        if new_pos < 0 or new_pos > 10:  # Assuming world bounds
-            return -100  # Invalid move
+        if new_pos < self.bounds[0] or new_pos > self.bounds[1]:
+            return self.INVALID_MOVE_UTILITY  # Invalid move
 
-        utility = -1  # Base cost for moving
+        utility = -self.MOVE_COST  # Base cost for moving
 
         if self.has_package:
             # Carrying package - utility based on distance to delivery
             distance_to_delivery = abs(new_pos - self.world.delivery_location)
-            utility -= distance_to_delivery * 0.5
+            utility -= distance_to_delivery * self.DISTANCE_WEIGHT
             # High reward for getting closer to delivery
             if distance_to_delivery < abs(self.position - self.world.delivery_location):
-                utility += 2
+                utility += self.CLOSER_BONUS
         else:
             # Not carrying package - utility based on distance to package
             distance_to_package = abs(new_pos - self.world.package_location)
-            utility -= distance_to_package * 0.5
+            utility -= distance_to_package * self.DISTANCE_WEIGHT
             # High reward for getting closer to package
             if distance_to_package < abs(self.position - self.world.package_location):
-                utility += 2
+                utility += self.CLOSER_BONUS
 
         return utility
 
@@ -59,18 +129,18 @@ class UtilityBasedDeliveryAgent:
         """Calculate utility for picking up package"""
         if (not self.has_package and
                 self.position == self.world.package_location):
-            return 10  # High reward for successful pickup
-        return -10  # Penalty for impossible pickup
+            return self.PICKUP_REWARD  # High reward for successful pickup
+        return self.PICKUP_PENALTY  # Penalty for impossible pickup
 
     def _utility_deliver(self):
         """Calculate utility for delivering package"""
         if (self.has_package and
                 self.position == self.world.delivery_location):
-            return 25  # Very high reward for delivery
-        return -20  # Penalty for impossible delivery
+            return self.DELIVERY_REWARD  # Very high reward for delivery
+        return self.DELIVERY_PENALTY  # Penalty for impossible delivery
 
-    def act(self):
-        """Choose and execute best action based on utility"""
+    def _choose_action(self):
+        """Choose the action with the highest utility"""
         possible_actions = ["move_left", "move_right"]
 
         # Add special actions if conditions are met
@@ -84,7 +154,24 @@ class UtilityBasedDeliveryAgent:
 
         # Choose action with higher utility
         best_action = max(action_utilities, key=action_utilities.get)
-        best_utility = action_utilities[best_action]
+        return best_action, action_utilities[best_action]
+
+    def _decision_key(self):
+        """Everything _choose_action() depends on; subclasses that decide differently extend it"""
+        return (self.position, self.has_package, self.world.package_location,
+                self.world.delivery_location, self.bounds, self._rewards_key)
+
+    def act(self):
+        """Choose and execute best action based on utility"""
+        if self.decision_cache is None:
+            best_action, best_utility = self._choose_action()
+        else:
+            key = self._decision_key()
+            decision = self.decision_cache.get(key)
+            if decision is None:
+                decision = self._choose_action()
+                self.decision_cache.put(key, decision)
+            best_action, best_utility = decision
 
         # Execute the action
         if best_action == "move_left":
@@ -99,9 +186,16 @@ class UtilityBasedDeliveryAgent:
 
         return best_action, best_utility
 
-    def run(self, world_state, max_steps=20):
-        """Run the utility-based agent"""
+    def run(self, world_state, max_steps=20, trace=None):
+        """
+        Run the utility-based agent.
+        If a TraceBuffer is given the run is quiet: each step is recorded as
+        an AGENT_TRACE_FIELDS tuple instead of being printed.
+        """
         self.perceive(world_state)
+        if trace is not None:
+            return self._run_quiet(max_steps, trace.append)
+
         print("\nUtility-Based Agent Starting!")
         print(f"Package at: {self.world.package_location}, Deliver to: {self.world.delivery_location}")
         print("=" * 40)
@@ -118,6 +212,15 @@ class UtilityBasedDeliveryAgent:
         print("Failed to deliver package")
         return False
 
+    def _run_quiet(self, max_steps, record):
+        act = self.act
+        for step in range(1, max_steps + 1):
+            action, utility = act()
+            record((step, self.position, action, utility, self.has_package))
+            if self.package_delivered:
+                return True
+        return False
+
 
 class WorldState:
     def __init__(self, package_loc, delivery_loc):
@@ -155,34 +258,22 @@ class RiverProblemSolvingAgent:
 
     def _get_next_states(self, current_state):
         """Generates all possible valid moves from the current state."""
-        farmer, wolf, duck, corn = current_state
-        possible_next_states = []
+        if type(self)._is_valid is RiverProblemSolvingAgent._is_valid:
+            # successors.py checks these same rules before building a tuple
+            return list(iter_river_successors(current_state))
 
+        farmer = current_state[0]
         destination = 'N' if farmer == 'S' else 'S'
-
-        # Helper to create a new state tuple
-        def move(item_index):
+        possible_next_states = []
+        # Farmer alone, then Farmer + Wolf, Duck or Corn (by state index)
+        for item_index in (0, 1, 2, 3):
+            if current_state[item_index] != farmer:
+                continue
             new_state_list = list(current_state)
-            new_state_list[0] = destination  # Move farmer
-            if item_index != -1:
-                new_state_list[item_index + 1] = destination  # Move item
-            return tuple(new_state_list)
-
-        # Items to try moving (by index):
-        # -1: Farmer alone
-        #  0: Farmer + Wolf
-        #  1: Farmer + Duck
-        #  2: Farmer + Corn
-        items_on_same_bank = [-1]  # Farmer can always try to cross alone
-        if wolf == farmer: items_on_same_bank.append(0)
-        if duck == farmer: items_on_same_bank.append(1)
-        if corn == farmer: items_on_same_bank.append(2)
-
-        for item_index in items_on_same_bank:
-            next_state = move(item_index)
+            new_state_list[0] = new_state_list[item_index] = destination
+            next_state = tuple(new_state_list)
             if self._is_valid(next_state):
                 possible_next_states.append(next_state)
-
         return possible_next_states
 
     def solve(self):
@@ -211,45 +302,48 @@ class RiverProblemSolvingAgent:
 
         return None  # No solution found
 
-    def _format_state(self, state):
-        """Helper function to make the state output readable."""
-        farmer, wolf, duck, corn = state
-
-        south_bank = []
-        north_bank = []
+    def solve_with_budget(self, deadline=None, progress=None):
+        """
+        BFS that stops at a deadline (a time.monotonic() timestamp) or when
+        the progress callback (called with a search.LayerEvent per layer)
+        returns False.  Always returns a search.SearchResult, holding
+        counters and the best partial path if the search stopped early.
+        """
+        return bounded_bfs(self, deadline, progress=progress)
 
-        if farmer == 'S':
-            south_bank.append('Farmer')
-        else:
-            north_bank.append('Farmer')
+    # search.bounded_bfs works on next_states() / heuristic()
+    def next_states(self, state):
+        return self._get_next_states(state)
 
-        if wolf == 'S':
-            south_bank.append('Wolf')
-        else:
-            north_bank.append('Wolf')
+    def heuristic(self, state):
+        """Items still on the South bank: each crossing moves at most one."""
+        return state[1:].count('S')
 
-        if duck == 'S':
-            south_bank.append('Duck')
-        else:
-            north_bank.append('Duck')
+    # All 16 labels are built once and shared by every agent
+    _labels = StateLabelTable(("Farmer", "Wolf", "Duck", "Corn"))
 
-        if corn == 'S':
-            south_bank.append('Corn')
-        else:
-            north_bank.append('Corn')
+    def _format_state(self, state):
+        """Helper function to make the state output readable."""
+        return self._labels.label(encode_state(state))
 
-        south_str = ", ".join(south_bank) if south_bank else "Empty"
-        north_str = ", ".join(north_bank) if north_bank else "Empty"
-        return f"South: [{south_str}] | North: [{north_str}]"
+    def print_solution(self, path, trace=None):
+        """
+        Prints the solution path in a human-readable format.
+        With a TraceBuffer nothing is printed: each step is recorded as a
+        SOLUTION_TRACE_FIELDS tuple instead.
+        """
+        if trace is not None:
+            for i, state in enumerate(path or ()):
+                trace.append((i, state))
+            return
 
-    def print_solution(self, path):
-        """Prints the solution path in a human-readable format."""
         if not path:
             print("No solution found.")
             return
 
-        print(f"✅ Solution Found in {len(path) - 1} steps!\n")
-        print(f"Step 0 (Start): {self._format_state(path[0])}")
+        # Build the whole output first and write it once
+        lines = [f"✅ Solution Found in {len(path) - 1} steps!\n",
+                 f"Step 0 (Start): {self._format_state(path[0])}"]
 
         for i in range(1, len(path)):
             prev_state = path[i - 1]
@@ -268,8 +362,10 @@ class RiverProblemSolvingAgent:
             else:
                 move += " returns alone"
 
-            print(f"\nStep {i}: {move} {direction}")
-            print(f"       Result: {self._format_state(curr_state)}")
+            lines.append(f"\nStep {i}: {move} {direction}")
+            lines.append(f"       Result: {self._format_state(curr_state)}")
+
+        sys.stdout.write("\n".join(lines) + "\n")
 
 
 # --- Main execution block to run both agents ---
@@ -121,9 +121,17 @@ class UtilityBasedDeliveryAgent:
 
         return best_action, best_utility  # إرجاع الإجراء وقيمته للطباعة
 
-    def run(self, world_state, max_steps=20):
+    def run(self, world_state, max_steps=20, trace=None):
         """تشغيل دورة حياة الوكيل"""
         self.perceive(world_state)  # إدراك العالم أولاً
+        if trace is not None:
+            # مع TraceBuffer لا تتم الطباعة: تُسجَّل كل خطوة كـ (step, position, action, utility, has_package)
+            for step in range(1, max_steps + 1):
+                action, utility = self.act()
+                trace.append((step, self.position, action, utility, self.has_package))
+                if self.package_delivered:
+                    return True
+            return False
         print("\nUtility-Based Agent Starting! (بدأ الوكيل القائم على المنفعة)")
         print(f"Package at: {self.world.package_location}, Deliver to: {self.world.delivery_location}")
         print("=" * 40)
@@ -277,8 +285,14 @@ class RiverProblemSolvingAgent:
         north_str = ", ".join(north_bank) if north_bank else "Empty"
         return f"South: [{south_str}] | North: [{north_str}]"
 
-    def print_solution(self, path):
+    def print_solution(self, path, trace=None):
         """تطبع مسار الحل بتنسيق يسهل على البشر قراءته."""
+        if trace is not None:
+            # مع TraceBuffer لا تتم الطباعة: تُسجَّل كل خطوة كـ (step, state)
+            for i, state in enumerate(path or ()):
+                trace.append((i, state))
+            return
+
         if not path:
             print("No solution found. (لم يتم العثور على حل)")
             return
@@ -1,9 +1,38 @@
 from collections import deque
 
+from move_tables import move_table
+from search import bounded_bfs
+
 # تعريف ثابت للحالة الكلية (لتسهيل القراءة)
 TOTAL_M = 3
 TOTAL_C = 3
 
+# أسماء الحقول لسجلات TraceBuffer التي تكتبها print_solution()
+SOLUTION_TRACE_FIELDS = ("step", "missionaries", "cannibals", "boat")
+
+# جدول الحركات الممكنة (M_move, C_move) لقارب يتسع لشخصين، يُحسب مرة واحدة
+MOVES = move_table(2)
+
+
+def valid_counts(missionaries, cannibals):
+    # التحقق من الحدود (الأعداد بين 0 و 3)
+    if not (0 <= missionaries <= TOTAL_M and 0 <= cannibals <= TOTAL_C):
+        return False
+
+    # 1. التحقق من قيد الضفة اليسرى (الضفة الحالية)
+    # إذا كان M > 0 و C > M (آكلو لحوم البشر أكثر من المبشرين)
+    if missionaries > 0 and missionaries < cannibals:
+        return False
+
+    # 2. التحقق من قيد الضفة اليمنى (الضفة المعاكسة)
+    m_right = TOTAL_M - missionaries
+    c_right = TOTAL_C - cannibals
+    # إذا كان M_Right > 0 و C_Right > M_Right
+    if m_right > 0 and m_right < c_right:
+        return False
+
+    return True
+
 
 class State:
     def __init__(self, missionaries, cannibals, boat):
@@ -14,23 +43,7 @@ class State:
         self.action_taken = ""  # لتخزين الحركة التي أدت لهذه الحالة
 
     def is_valid(self):
-        # التحقق من الحدود (الأعداد بين 0 و 3)
-        if not (0 <= self.missionaries <= TOTAL_M and 0 <= self.cannibals <= TOTAL_C):
-            return False
-
-        # 1. التحقق من قيد الضفة اليسرى (الضفة الحالية)
-        # إذا كان M > 0 و C > M (آكلو لحوم البشر أكثر من المبشرين)
-        if self.missionaries > 0 and self.missionaries < self.cannibals:
-            return False
-
-        # 2. التحقق من قيد الضفة اليمنى (الضفة المعاكسة)
-        m_right = TOTAL_M - self.missionaries
-        c_right = TOTAL_C - self.cannibals
-        # إذا كان M_Right > 0 و C_Right > M_Right
-        if m_right > 0 and m_right < c_right:
-            return False
-
-        return True
+        return valid_counts(self.missionaries, self.cannibals)
 
     def is_goal(self):
         # الهدف: 0 مبشر و 0 آكل لحوم بشر في اليسار، والقارب في اليمين (1)
@@ -52,43 +65,45 @@ class State:
         return f"Left Bank: ({self.missionaries}M, {self.cannibals}C) | Boat: {side} | Right Bank: ({m_right}M, {c_right}C)"
 
 
+def _action_name(m_move, c_move, direction):
+    # توضيح الحركة التي أدت إلى الحالة الجديدة
+    action_name = f"نقل {m_move}M و {c_move}C"
+    if direction == 1:
+        return action_name + " ← (لليسار)"
+    return action_name + " → (لليمين)"
+
+
+# أسماء الحركات تُبنى مرة واحدة لكل (حمولة، اتجاه) بدلاً من كل حالة
+ACTION_NAMES = {}
+
+
 def get_successors(current_state):
-    successors = []
-    # الحركات الممكنة: (M_move, C_move)
-    moves = [(1, 0), (2, 0), (0, 1), (0, 2), (1, 1)]
+    # مولّد: يعيد الحالات التالية الصالحة واحدة تلو الأخرى
 
     # إذا كان القارب في اليسار (0)، الاتجاه هو +1 (نقل لليمين)
     # إذا كان القارب في اليمين (1)، الاتجاه هو -1 (نقل لليسار)
     direction = 1 if current_state.boat == 0 else -1
+    m, c = current_state.missionaries, current_state.cannibals
+    new_boat = 1 - current_state.boat  # عكس موقع القارب
 
-    for m_move, c_move in moves:
-        # يجب أن يكون عدد الركاب 1 أو 2
-        if not (1 <= m_move + c_move <= 2):
-            continue
+    # الجدول يحتوي فقط على الحمولات الصالحة (1 أو 2 ركاب)
+    for move in MOVES.moves:
+        # 1. تحديد الأعداد الجديدة (Boat moves from B to 1-B)
+        new_m = m - direction * move[0]
+        new_c = c - direction * move[1]
 
-        # 1. تحديد الحالة الجديدة (Boat moves from B to 1-B)
-        new_m = current_state.missionaries - (direction * m_move)
-        new_c = current_state.cannibals - (direction * c_move)
-        new_boat = 1 - current_state.boat  # عكس موقع القارب
+        # 2. التحقق من الصلاحية بالأرقام فقط، قبل إنشاء أي كائن
+        if not valid_counts(new_m, new_c):
+            continue
 
+        # 3. توثيق الحركة والأصل (للتتبع)
         new_state = State(new_m, new_c, new_boat)
-
-        # 2. التحقق من صلاحية الحالة الجديدة
-        if new_state.is_valid():
-            # 3. توثيق الحركة والأصل (للتتبع)
-            new_state.parent = current_state
-
-            # توضيح الحركة التي أدت إلى هذه الحالة الجديدة
-            action_name = f"نقل {m_move}M و {c_move}C"
-            if direction == 1:
-                action_name += " ← (لليسار)"
-            else:
-                action_name += " → (لليمين)"
-
-            new_state.action_taken = action_name
-            successors.append(new_state)
-
-    return successors
+        new_state.parent = current_state
+        action_name = ACTION_NAMES.get((move, direction))
+        if action_name is None:
+            action_name = ACTION_NAMES[move, direction] = _action_name(*move, direction)
+        new_state.action_taken = action_name
+        yield new_state
 
 
 def solve_bfs():
@@ -119,7 +134,30 @@ def solve_bfs():
     return None
 
 
-def print_solution(solution):
+def solve_bfs_with_budget(deadline=None, progress=None):
+    """
+    BFS محدود بموعد نهائي (طابع time.monotonic()) أو بدالة progress تُستدعى
+    مع search.LayerEvent بعد كل طبقة (إرجاع False يوقف البحث).
+    يعيد دائماً search.SearchResult؛ path قائمة من كائنات State، وآخرها
+    يصلح لـ print_solution().
+    """
+    return bounded_bfs(_BfsProblem(), deadline, progress=progress)
+
+
+class _BfsProblem:
+    # ما تحتاجه search.bounded_bfs، فوق كائنات State في هذا الملف
+    def __init__(self):
+        self.START_STATE = State(TOTAL_M, TOTAL_C, 0)
+        self.GOAL_STATE = State(0, 0, 1)
+
+    next_states = staticmethod(get_successors)
+
+    @staticmethod
+    def heuristic(state):
+        return state.missionaries + state.cannibals
+
+
+def print_solution(solution, trace=None):
     path = []
     curr = solution
 
@@ -130,6 +168,12 @@ def print_solution(solution):
 
     path.reverse()  # عكس المسار لطباعته من البداية للنهاية
 
+    # وضع صامت: تسجيل كل خطوة في TraceBuffer بدون طباعة أو تنسيق نصوص
+    if trace is not None:
+        for i, state in enumerate(path):
+            trace.append((i, state.missionaries, state.cannibals, state.boat))
+        return
+
     print("Missionaries & Cannibals Solution (Goal-Based Agent/BFS):")
     print("-" * 75)
 
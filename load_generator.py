@@ -0,0 +1,78 @@
+import argparse
+import asyncio
+import json
+import random
+import time
+
+
+# --- Load generator for puzzle_service.py ---
+# Opens several connections to a running service, sends puzzle requests
+# drawn from a pool of distinct puzzles, and reports throughput and
+# latency percentiles.  A small pool exercises caching and coalescing, a
+# large one exercises the worker pool.
+
+def make_puzzle_pool(distinct, seed=0):
+    rng = random.Random(seed)
+    pool = []
+    for i in range(distinct):
+        if i % 2 == 0:
+            count = rng.randint(3, 10)
+            pool.append({"type": "mc", "missionaries": count, "cannibals": count,
+                         "boat_capacity": rng.randint(3, 4)})
+        else:
+            items = [f"Item{j}" for j in range(rng.randint(4, 9))]
+            eats = [[items[j], items[j + 1]] for j in range(0, len(items) - 1, 3)]
+            pool.append({"type": "river", "items": items, "eats": eats,
+                         "boat_capacity": rng.randint(1, 3)})
+    return pool
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+async def client(host, port, requests, pool, rng, latencies, errors):
+    reader, writer = await asyncio.open_connection(host, port, limit=1 << 20)
+    try:
+        for request_id in range(requests):
+            line = json.dumps({"id": request_id, "puzzle": rng.choice(pool)}).encode() + b"\n"
+            start = time.perf_counter()
+            writer.write(line)
+            await writer.drain()
+            response = json.loads(await reader.readline())
+            latencies.append(time.perf_counter() - start)
+            if "error" in response:
+                errors.append(response["error"])
+    finally:
+        writer.close()
+
+
+async def run_load(host="127.0.0.1", port=8765, connections=32, requests=50, distinct=20, seed=0):
+    pool = make_puzzle_pool(distinct, seed)
+    latencies, errors = [], []
+    start = time.perf_counter()
+    await asyncio.gather(*(client(host, port, requests, pool, random.Random(seed + i), latencies, errors)
+                           for i in range(connections)))
+    elapsed = time.perf_counter() - start
+
+    total = len(latencies)
+    print(f"Requests: {total} over {connections} connections in {elapsed:.2f} s")
+    print(f"Throughput: {total / elapsed:.1f} requests/s")
+    print(f"Latency p50: {percentile(latencies, 0.50) * 1000:.2f} ms, "
+          f"p99: {percentile(latencies, 0.99) * 1000:.2f} ms, "
+          f"max: {max(latencies) * 1000:.2f} ms")
+    if errors:
+        print(f"Errors: {len(errors)} (first: {errors[0]})")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Load generator for puzzle_service.py")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--connections", type=int, default=32)
+    parser.add_argument("--requests", type=int, default=50, help="requests per connection")
+    parser.add_argument("--distinct", type=int, default=20, help="number of distinct puzzles")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    asyncio.run(run_load(args.host, args.port, args.connections, args.requests, args.distinct, args.seed))
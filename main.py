@@ -1,5 +1,12 @@
+import sys
 from collections import deque
 
+from state_labels import StateLabelTable, encode_state, list_label
+from successors import iter_river_successors
+
+# Field names for TraceBuffer records written by print_solution()
+SOLUTION_TRACE_FIELDS = ("step", "state")
+
 
 def solve_river_problem():
     """
@@ -14,63 +21,8 @@ def solve_river_problem():
     START_STATE = ('S', 'S', 'S', 'S')
     GOAL_STATE = ('N', 'N', 'N', 'N')
 
-    def is_valid(state):
-        """Checks if a given state is valid (no one gets eaten)."""
-        farmer, wolf, duck, corn = state
-
-        # Case 1: Wolf eats Duck
-        # This happens if they are on the same bank, and the farmer is on the other.
-        if wolf == duck and farmer != wolf:
-            return False
-
-        # Case 2: Duck eats Corn
-        # This happens if they are on the same bank, and the farmer is on the other.
-        if duck == corn and farmer != duck:
-            return False
-
-        # If neither of the above, the state is safe.
-        return True
-
-    def get_next_states(current_state):
-        """Generates all possible valid moves from the current state."""
-        farmer, wolf, duck, corn = current_state
-        possible_next_states = []
-
-        # Determine the destination bank
-        destination = 'N' if farmer == 'S' else 'S'
-
-        # Helper to create a new state tuple
-        def move(item_index):
-            new_state_list = list(current_state)
-            # Move farmer
-            new_state_list[0] = destination
-            # Move item (if not -1)
-            if item_index != -1:
-                new_state_list[item_index + 1] = destination
-            return tuple(new_state_list)
-
-        # Possible moves:
-        # -1: Farmer alone
-        #  0: Farmer + Wolf
-        #  1: Farmer + Duck
-        #  2: Farmer + Corn
-
-        items_to_try = [-1]  # Farmer can always try to cross alone
-
-        # Check which items are on the same bank as the farmer
-        if wolf == farmer:
-            items_to_try.append(0)
-        if duck == farmer:
-            items_to_try.append(1)
-        if corn == farmer:
-            items_to_try.append(2)
-
-        for item_index in items_to_try:
-            next_state = move(item_index)
-            if is_valid(next_state):
-                possible_next_states.append(next_state)
-
-        return possible_next_states
+    # Valid moves come from successors.iter_river_successors, which checks
+    # that no one gets eaten before building each new state.
 
     # --- 2. Implement Breadth-First Search (BFS) ---
 
@@ -90,7 +42,7 @@ def solve_river_problem():
             return current_path  # Success! Return the solution path.
 
         # Explore neighbors (next possible moves)
-        for next_state in get_next_states(last_state):
+        for next_state in iter_river_successors(last_state):
             if next_state not in visited:
                 visited.add(next_state)
                 new_path = current_path + [next_state]
@@ -100,68 +52,33 @@ def solve_river_problem():
     return None
 
 
-def format_state(state):
-    """Helper function to make the state output readable."""
-    farmer, wolf, duck, corn = state
-
-    south_bank = []
-    north_bank = []
-
-    if farmer == 'S':
-        south_bank.append('Farmer')
-    else:
-        north_bank.append('Farmer')
-
-    if wolf == 'S':
-        south_bank.append('Wolf')
-    else:
-        north_bank.append('Wolf')
-
-    if duck == 'S':
-        south_bank.append('Duck')
-    else:
-        north_bank.append('Corn')
-
-    if corn == 'S':
-        south_bank.append('Corn')
-    else:
-        north_bank.append('Duck')  # Corrected: Was corn, should be duck
+# Every label is built once, keyed by the state's integer encoding
+STATE_LABELS = StateLabelTable(("Farmer", "Wolf", "Duck", "Corn"), label=list_label)
 
-    # Correction: The previous logic was flawed. Let's simplify.
-    south_bank = []
-    north_bank = []
 
-    if farmer == 'S':
-        south_bank.append('Farmer')
-    else:
-        north_bank.append('Farmer')
-
-    if wolf == 'S':
-        south_bank.append('Wolf')
-    else:
-        north_bank.append('Wolf')
-
-    if duck == 'S':
-        south_bank.append('Duck')
-    else:
-        north_bank.append('Duck')
-
-    if corn == 'S':
-        south_bank.append('Corn')
-    else:
-        north_bank.append('Corn')
+def format_state(state):
+    """Helper function to make the state output readable."""
+    return STATE_LABELS.label(encode_state(state))
 
-    return f"South: {south_bank if south_bank else ['Empty']} | North: {north_bank if north_bank else ['Empty']}"
 
+def print_solution(path, trace=None):
+    """
+    Prints the solution path in a human-readable format.
+    With a TraceBuffer nothing is printed: each step is recorded as a
+    SOLUTION_TRACE_FIELDS tuple instead.
+    """
+    if trace is not None:
+        for i, state in enumerate(path or ()):
+            trace.append((i, state))
+        return
 
-def print_solution(path):
-    """Prints the solution path in a human-readable format."""
     if not path:
         print("No solution found.")
         return
 
-    print("✅ Solution Found in 7 steps!\n")
-    print(f"Step 0 (Start): {format_state(path[0])}")
+    # Build the whole output first and write it once
+    lines = ["✅ Solution Found in 7 steps!\n",
+             f"Step 0 (Start): {format_state(path[0])}"]
 
     for i in range(1, len(path)):
         prev_state = path[i - 1]
@@ -188,8 +105,10 @@ def print_solution(path):
         else:
             move += " (North → South)"
 
-        print(f"\nStep {i}: {move}")
-        print(f"       Result: {format_state(curr_state)}")
+        lines.append(f"\nStep {i}: {move}")
+        lines.append(f"       Result: {format_state(curr_state)}")
+
+    sys.stdout.write("\n".join(lines) + "\n")
 
 
 # --- 3. Run the Solver ---
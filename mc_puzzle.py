@@ -0,0 +1,143 @@
+import sys
+from collections import deque
+
+from move_tables import move_table
+from search import bounded_bfs
+from state_ranking import CountRanker
+
+
+# --- Generalized Missionaries & Cannibals ---
+# Same encoding as lab2.py: a state is (missionaries_left, cannibals_left,
+# boat) where boat 0 is the left bank (start) and 1 the right bank (goal).
+# States are plain tuples so they hash fast and can be sent between
+# processes.  boat_rules are names from move_tables.BOAT_RULES.
+
+class MissionariesCannibalsPuzzle:
+    def __init__(self, missionaries=3, cannibals=3, boat_capacity=2, boat_rules=()):
+        self.total_m = missionaries
+        self.total_c = cannibals
+        self.boat_capacity = boat_capacity
+        self.boat_rules = tuple(boat_rules)
+        self.moves = move_table(boat_capacity, rules=self.boat_rules).moves
+        self.ranker = CountRanker((missionaries, cannibals))
+
+        self.START_STATE = (missionaries, cannibals, 0)
+        self.GOAL_STATE = (0, 0, 1)
+
+    def spec(self):
+        spec = {"type": "mc", "missionaries": self.total_m, "cannibals": self.total_c,
+                "boat_capacity": self.boat_capacity}
+        if self.boat_rules:
+            spec["boat_rules"] = list(self.boat_rules)
+        return spec
+
+    def encode(self, state):
+        """Packs a state into its dense rank in [0, len(self.ranker))."""
+        return self.ranker.rank(state)
+
+    def decode(self, code):
+        return self.ranker.unrank(code)
+
+    def is_valid(self, state):
+        m, c, boat = state
+        if not (0 <= m <= self.total_m and 0 <= c <= self.total_c):
+            return False
+        # Missionaries may not be outnumbered on either bank
+        if 0 < m < c:
+            return False
+        m_right = self.total_m - m
+        c_right = self.total_c - c
+        if 0 < m_right < c_right:
+            return False
+        return True
+
+    def next_states(self, state):
+        """
+        Yields all valid states reachable with one boat trip.  The
+        is_valid() rules are checked inline on the counts, so tuples are
+        only built for valid states.
+        """
+        m, c, boat = state
+        direction = -1 if boat == 0 else 1  # Leaving the left bank removes people from it
+        total_m, total_c = self.total_m, self.total_c
+        next_boat = 1 - boat
+        for m_move, c_move in self.moves:
+            next_m = m + direction * m_move
+            next_c = c + direction * c_move
+            if not (0 <= next_m <= total_m and 0 <= next_c <= total_c):
+                continue
+            if 0 < next_m < next_c or 0 < total_m - next_m < total_c - next_c:
+                continue
+            yield next_m, next_c, next_boat
+
+    def heuristic(self, state):
+        """
+        Admissible estimate of the trips left: each round trip moves at most
+        boat_capacity - 1 people to the right bank (someone rows back).
+        """
+        m, c, boat = state
+        people = m + c
+        if boat == 1:
+            if people == 0:
+                return 0
+            people += 1  # Someone has to row back first
+        if people <= self.boat_capacity or self.boat_capacity < 2:
+            return 1 + (boat == 1)
+        return 2 * -(-(people - self.boat_capacity) // (self.boat_capacity - 1)) + 1 + (boat == 1)
+
+    def solve(self):
+        """
+        Solves the puzzle with Breadth-First Search.
+        Returns the shortest list of states from start to goal, or None.
+        """
+        parents = {self.START_STATE: None}
+        queue = deque([self.START_STATE])
+
+        while queue:
+            state = queue.popleft()
+            if state == self.GOAL_STATE:
+                path = []
+                while state is not None:
+                    path.append(state)
+                    state = parents[state]
+                path.reverse()
+                return path
+            for next_state in self.next_states(state):
+                if next_state not in parents:
+                    parents[next_state] = state
+                    queue.append(next_state)
+        return None
+
+    def solve_with_budget(self, deadline=None, progress=None):
+        """
+        BFS that stops at a deadline (a time.monotonic() timestamp) or when
+        the progress callback (called with a search.LayerEvent per layer)
+        returns False.  Always returns a search.SearchResult, holding
+        counters and the best partial path if the search stopped early.
+        """
+        return bounded_bfs(self, deadline, progress=progress)
+
+    def format_state(self, state):
+        m, c, boat = state
+        side = "Right" if boat == 1 else "Left"
+        return (f"Left Bank: ({m}M, {c}C) | Boat: {side} | "
+                f"Right Bank: ({self.total_m - m}M, {self.total_c - c}C)")
+
+    def print_solution(self, path, out=None):
+        """Prints the solution path with a single buffered write."""
+        if not path:
+            (out or sys.stdout).write("No solution found.\n")
+            return
+        lines = ["Missionaries & Cannibals Solution (BFS):", "-" * 75]
+        lines += [f"Step {i}: {self.format_state(state)}" for i, state in enumerate(path)]
+        lines += ["-" * 75, f"Goal Reached in {len(path) - 1} steps!"]
+        (out or sys.stdout).write("\n".join(lines) + "\n")
+
+
+if __name__ == "__main__":
+    puzzle = MissionariesCannibalsPuzzle()
+    puzzle.print_solution(puzzle.solve())
+
+    print()
+    puzzle = MissionariesCannibalsPuzzle(missionaries=5, cannibals=5, boat_capacity=3)
+    puzzle.print_solution(puzzle.solve())
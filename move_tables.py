@@ -0,0 +1,64 @@
+from array import array
+from functools import lru_cache
+from itertools import product
+
+
+# --- Precomputed boat loads ---
+# A move table lists every valid boat load for a boat capacity and a set of
+# passenger types, once.  Loads are count tuples in the order of the types.
+# The order generalizes the literal list in lab2.py: single-type loads
+# first (per type, smallest first), then mixed loads.  For a boat for two
+# that is exactly (1, 0), (2, 0), (0, 1), (0, 2), (1, 1).
+
+# Named rules about who may share the boat; a rule gets {type: count}
+BOAT_RULES = {
+    "missionaries_not_outnumbered":
+        lambda load: not (0 < load.get("missionaries", 0) < load.get("cannibals", 0)),
+}
+
+
+class MoveTable:
+    def __init__(self, capacity, types, rules):
+        self.capacity = capacity
+        self.types = types
+        self.rules = rules
+
+        loads = [load for load in product(range(capacity + 1), repeat=len(types))
+                 if 1 <= sum(load) <= capacity]
+        checks = [BOAT_RULES[rule] for rule in rules]
+        loads = [load for load in loads if all(check(dict(zip(types, load))) for check in checks)]
+        loads.sort(key=lambda load: (sum(1 for n in load if n), [n == 0 for n in load], load))
+        self.moves = tuple(loads)
+
+        # The same loads as one array per passenger type (struct of arrays),
+        # ready for numpy.frombuffer in vectorized successor generators.  Int
+        # items, so boats for more than 127 people fit as well.
+        self.columns = tuple(array("i", [load[i] for load in loads]) for i in range(len(types)))
+        self.totals = array("i", [sum(load) for load in loads])
+
+    def column(self, passenger_type):
+        return self.columns[self.types.index(passenger_type)]
+
+    def index(self, load):
+        """Position of a load in the table (used as a compact move code)."""
+        return self.moves.index(tuple(load))
+
+    def __len__(self):
+        return len(self.moves)
+
+    def __iter__(self):
+        return iter(self.moves)
+
+
+@lru_cache(maxsize=None)
+def move_table(capacity=2, types=("missionaries", "cannibals"), rules=()):
+    """Returns the shared, cached MoveTable for these parameters."""
+    return MoveTable(capacity, tuple(types), tuple(rules))
+
+
+if __name__ == "__main__":
+    print("Boat for two:", move_table(2).moves)
+    table = move_table(3, rules=("missionaries_not_outnumbered",))
+    print("Boat for three, no outnumbering in the boat:", table.moves)
+    table = move_table(3, types=("adults", "children", "dogs"))
+    print(f"Three passenger types, boat for three: {len(table)} loads, dogs column {table.column('dogs').tolist()}")
@@ -0,0 +1,246 @@
+import struct
+
+from move_tables import move_table
+from state_labels import encode_state
+
+
+# --- Compact binary encoding for solution paths and run traces ---
+# A path is stored as its start state plus one small code per step:
+#   river:   which item crossed with the farmer (0 = alone) -> 2 bits for
+#            the classic puzzle, or a bitmask of items for bigger boats
+#   M&C:     index of the (missionaries, cannibals) move -> 3 bits for a
+#            boat for two
+#   actions: index into ACTION_CODES -> 3 bits per delivery agent step
+# Codes are packed LSB-first into bytes.  Every record starts with a small
+# header, so records can be concatenated into one file.
+
+MAGIC = b"PTH1"
+KIND_RIVER, KIND_MC, KIND_ACTIONS = 1, 2, 3
+MODE_INDEX, MODE_MASK, MODE_EMPTY = 0, 1, 2  # MODE_EMPTY: a path without any state
+
+ACTION_CODES = ("move_left", "move_right", "pickup_package", "package_delivered", "wait")
+
+_HEADER = struct.Struct("<4sBBBxI")  # magic, kind, mode, bits per step, step count
+_RIVER_PARAMS = struct.Struct("<BQ")  # entities (farmer included), start state
+_MC_PARAMS = struct.Struct("<HHHHBBB")  # totals, start (m, c, boat), boat_left, capacity
+
+
+def bits_for(count):
+    """Number of bits needed to store the values 0 .. count - 1."""
+    return max(1, (count - 1).bit_length())
+
+
+def pack_codes(codes, bits):
+    out = bytearray()
+    acc = filled = 0
+    for code in codes:
+        acc |= code << filled
+        filled += bits
+        while filled >= 8:
+            out.append(acc & 0xFF)
+            acc >>= 8
+            filled -= 8
+    if filled:
+        out.append(acc)
+    return bytes(out)
+
+
+def unpack_codes(data, bits, count):
+    codes = []
+    mask = (1 << bits) - 1
+    acc = filled = 0
+    data = iter(data)
+    for _ in range(count):
+        while filled < bits:
+            acc |= next(data) << filled
+            filled += 8
+        codes.append(acc & mask)
+        acc >>= bits
+        filled -= bits
+    return codes
+
+
+def _payload_size(bits, count):
+    return (bits * count + 7) // 8
+
+
+# --- River crossing paths (lab1.py / main.py tuples or RiverPuzzle ints) ---
+
+def encode_river_path(path, size=None):
+    """
+    Encodes a list of river states.  States are ('S'/'N', ...) tuples or
+    RiverPuzzle integers; for integers, size (entities incl. farmer)
+    defaults to the highest bit the path uses.
+    """
+    if not path:
+        header = _HEADER.pack(MAGIC, KIND_RIVER, MODE_EMPTY, 1, 0)
+        return header + _RIVER_PARAMS.pack(size or 0, 0)
+    if not isinstance(path[0], int):
+        size = len(path[0])
+        path = [encode_state(state) for state in path]
+    elif size is None:
+        size = max(1, max(path).bit_length())
+    cargo = [(prev ^ curr) >> 1 for prev, curr in zip(path, path[1:])]
+
+    if all(c & (c - 1) == 0 for c in cargo):
+        # At most one item per crossing: store the item number (0 = alone)
+        mode, bits = MODE_INDEX, bits_for(size)
+        codes = [c.bit_length() for c in cargo]
+    else:
+        mode, bits = MODE_MASK, max(1, size - 1)
+        codes = cargo
+
+    header = _HEADER.pack(MAGIC, KIND_RIVER, mode, bits, len(codes))
+    params = _RIVER_PARAMS.pack(size, path[0])
+    return header + params + pack_codes(codes, bits)
+
+
+def _decode_river(mode, bits, count, data):
+    size, state = _RIVER_PARAMS.unpack_from(data)
+    if mode == MODE_EMPTY:
+        return [], _RIVER_PARAMS.size
+    codes = unpack_codes(data[_RIVER_PARAMS.size:], bits, count)
+    path = [state]
+    for code in codes:
+        cargo = (1 << (code - 1) if code else 0) if mode == MODE_INDEX else code
+        state ^= 1 | cargo << 1
+        path.append(state)
+    return path, _RIVER_PARAMS.size + _payload_size(bits, count)
+
+
+# --- Missionaries & Cannibals paths (lab2.py / Marya_lab2.py) ---
+
+def mc_path_from_chain(state):
+    """Follows State.parent links and returns (m, c, boat) tuples, start first."""
+    path = []
+    while state:
+        path.append((state.missionaries, state.cannibals, state.boat))
+        state = state.parent
+    path.reverse()
+    return path
+
+
+def encode_mc_path(path, total_m=3, total_c=3, capacity=2, boat_left=0):
+    """
+    Encodes (m, c, boat) tuples or a State whose parent chain is the path.
+    boat_left is the boat value meaning "left bank" (0 in lab2.py,
+    1 in Marya_lab2.py).  None (what solve_bfs() returns without a
+    solution) is encoded like an empty path.
+    """
+    if not path:
+        header = _HEADER.pack(MAGIC, KIND_MC, MODE_EMPTY, 1, 0)
+        return header + _MC_PARAMS.pack(total_m, total_c, total_m, total_c, boat_left, boat_left, capacity)
+    if hasattr(path, "parent"):
+        path = mc_path_from_chain(path)
+    index = {move: i for i, move in enumerate(move_table(capacity).moves)}
+    codes = [index[(abs(prev[0] - curr[0]), abs(prev[1] - curr[1]))]
+             for prev, curr in zip(path, path[1:])]
+    bits = bits_for(len(index))
+
+    header = _HEADER.pack(MAGIC, KIND_MC, MODE_INDEX, bits, len(codes))
+    params = _MC_PARAMS.pack(total_m, total_c, *path[0], boat_left, capacity)
+    return header + params + pack_codes(codes, bits)
+
+
+def _decode_mc(mode, bits, count, data):
+    total_m, total_c, m, c, boat, boat_left, capacity = _MC_PARAMS.unpack_from(data)
+    if mode == MODE_EMPTY:
+        return [], _MC_PARAMS.size
+    moves = move_table(capacity).moves
+    path = [(m, c, boat)]
+    for code in unpack_codes(data[_MC_PARAMS.size:], bits, count):
+        dm, dc = moves[code]
+        if boat == boat_left:  # The boat leaves the left bank
+            m, c = m - dm, c - dc
+        else:
+            m, c = m + dm, c + dc
+        boat = 1 - boat
+        path.append((m, c, boat))
+    return path, _MC_PARAMS.size + _payload_size(bits, count)
+
+
+# --- Delivery agent action traces ---
+
+def encode_actions(actions):
+    """Encodes a sequence of action names (e.g. the 'action' field of a trace)."""
+    index = {action: i for i, action in enumerate(ACTION_CODES)}
+    codes = [index[action] for action in actions]
+    bits = bits_for(len(ACTION_CODES))
+    return _HEADER.pack(MAGIC, KIND_ACTIONS, MODE_INDEX, bits, len(codes)) + pack_codes(codes, bits)
+
+
+def _decode_actions(mode, bits, count, data):
+    codes = unpack_codes(data, bits, count)
+    return [ACTION_CODES[code] for code in codes], _payload_size(bits, count)
+
+
+_DECODERS = {KIND_RIVER: _decode_river, KIND_MC: _decode_mc, KIND_ACTIONS: _decode_actions}
+
+
+def decode(blob, offset=0):
+    """
+    Decodes one record.  Returns (kind, path, next_offset); the path is a
+    list of ints (river), (m, c, boat) tuples (M&C) or action names.
+    """
+    magic, kind, mode, bits, count = _HEADER.unpack_from(blob, offset)
+    if magic != MAGIC:
+        raise ValueError("not an encoded path")
+    start = offset + _HEADER.size
+    path, used = _DECODERS[kind](mode, bits, count, memoryview(blob)[start:])
+    return kind, path, start + used
+
+
+# --- File format: encoded records written back to back ---
+
+def write_path_file(filename, blobs):
+    with open(filename, "wb") as f:
+        for blob in blobs:
+            f.write(blob)
+
+
+def read_path_file(filename):
+    """Returns (kind, path) for every record in the file."""
+    with open(filename, "rb") as f:
+        data = f.read()
+    records = []
+    offset = 0
+    while offset < len(data):
+        kind, path, offset = decode(data, offset)
+        records.append((kind, path))
+    return records
+
+
+if __name__ == "__main__":
+    import pickle
+
+    import lab2
+    from lab1 import RiverProblemSolvingAgent
+    from river_puzzle import RiverPuzzle
+
+    river_path = RiverProblemSolvingAgent().solve()
+    blob = encode_river_path(river_path)
+    print(f"River path: {len(river_path) - 1} steps, {len(blob)} bytes encoded "
+          f"vs {len(pickle.dumps(river_path))} bytes pickled")
+    assert decode(blob)[1] == [encode_state(s) for s in river_path]
+
+    mc_path = mc_path_from_chain(lab2.solve_bfs())
+    blob = encode_mc_path(mc_path)
+    print(f"M&C path: {len(mc_path) - 1} steps, {len(blob)} bytes encoded "
+          f"vs {len(pickle.dumps(mc_path))} bytes pickled")
+    assert decode(blob)[1] == mc_path
+    assert decode(encode_mc_path([]))[1] == decode(encode_mc_path(None))[1] == []
+
+    puzzle = RiverPuzzle(items=[f"Item{i}" for i in range(12)], eats=(), boat_capacity=1)
+    long_path = puzzle.solve()
+    blob = encode_river_path(long_path, size=len(puzzle.names))
+    print(f"Generalized river path: {len(long_path) - 1} steps, {len(blob)} bytes encoded "
+          f"vs {len(pickle.dumps(long_path))} bytes pickled")
+    assert decode(blob)[1] == long_path
+    assert decode(encode_river_path(long_path))[1] == long_path  # size inferred from the states
+    assert decode(encode_river_path([]))[1] == []
+
+    actions = ["move_right", "move_left"] * 50000
+    blob = encode_actions(actions)
+    print(f"Agent action trace: {len(actions)} steps, {len(blob)} bytes encoded "
+          f"vs {len(pickle.dumps(actions))} bytes pickled")
+    assert decode(blob)[1] == actions
@@ -0,0 +1,246 @@
+import json
+import os
+import struct
+from collections import deque
+from itertools import combinations
+
+from river_puzzle import RiverPuzzle
+
+
+# --- Pattern databases for the generalized river crossing ---
+# A pattern is a subset of the items.  The projection of a state keeps the
+# farmer and the pattern items exactly and only counts how many of the other
+# items are on the North bank, as if they were interchangeable items that
+# eat nothing (the counting idea of symmetry.py).  Every real crossing is
+# also a crossing of this smaller puzzle, so its exact distances to the goal,
+# found once by a breadth-first search backwards from the goal, are an
+# admissible heuristic, and so is the max over several patterns.
+# Each table is a bytearray with one byte per abstract state,
+# 2^(k+1) * (n-k+1) for k pattern items out of n; UNREACHABLE marks states
+# that cannot reach the goal.
+
+UNREACHABLE = 255
+MAGIC = b"RPDB1"
+_HEADER = struct.Struct("<5sI")  # magic, spec length
+
+
+def choose_patterns(puzzle, pattern_size=10):
+    """Splits the items into patterns, keeping items that eat each other together."""
+    neighbors = {name: set() for name in puzzle.items}
+    for eater, eaten in puzzle.eats:
+        neighbors[eater].add(eaten)
+        neighbors[eaten].add(eater)
+
+    # Walk the eats-graph breadth-first so related items end up side by side
+    order, seen = [], set()
+    for root in puzzle.items:
+        if root in seen:
+            continue
+        seen.add(root)
+        queue = deque([root])
+        while queue:
+            name = queue.popleft()
+            order.append(name)
+            for other in sorted(neighbors[name], key=puzzle.items.index):
+                if other not in seen:
+                    seen.add(other)
+                    queue.append(other)
+    return [order[i:i + pattern_size] for i in range(0, len(order), pattern_size)]
+
+
+def build_table(puzzle, pattern):
+    """
+    Exact distances to the goal in the projection onto pattern.  Abstract
+    state index: rest << (k + 1) | bits, where bits holds the farmer (bit 0)
+    and the pattern items (bits 1..k) and rest counts the others on North.
+    """
+    kept = set(pattern)
+    abstract = RiverPuzzle(items=pattern,
+                           eats=[pair for pair in puzzle.eats if kept.issuperset(pair)],
+                           boat_capacity=puzzle.boat_capacity)
+    others = len(puzzle.items) - len(pattern)
+    shift = len(abstract.names)
+    capacity = puzzle.boat_capacity
+
+    table = bytearray([UNREACHABLE]) * ((others + 1) << shift)
+    goal = others << shift | abstract.GOAL_STATE
+    # Crossings are reversible, so searching forward from the goal finds
+    # the distances to it
+    table[goal] = 0
+    layer = [goal]
+    depth = 0
+    while layer:
+        depth = min(depth + 1, UNREACHABLE - 1)  # Capping keeps the bound admissible
+        next_layer = []
+        for index in layer:
+            rest, bits = index >> shift, index & ((1 << shift) - 1)
+            farmer_north = bits & 1
+            same_bank = bits if farmer_north else ~bits
+            movable = [1 << j for j in range(1, shift) if same_bank >> j & 1]
+            spare = rest if farmer_north else others - rest  # Other items beside the farmer
+            step = -1 if farmer_north else 1
+            for count in range(min(capacity, len(movable)) + 1):
+                for cargo in combinations(movable, count):
+                    next_bits = bits ^ 1 ^ sum(cargo)
+                    if not abstract.is_valid(next_bits):
+                        continue
+                    for extra in range(min(capacity - count, spare) + 1):
+                        next_index = (rest + step * extra) << shift | next_bits
+                        if table[next_index] == UNREACHABLE:
+                            table[next_index] = depth
+                            next_layer.append(next_index)
+        layer = next_layer
+    return table
+
+
+class PatternDatabase:
+    def __init__(self, puzzle, patterns=None, tables=None):
+        self.puzzle = puzzle
+        self.patterns = [list(pattern) for pattern in (patterns or choose_patterns(puzzle))]
+        self.tables = tables or [build_table(puzzle, pattern) for pattern in self.patterns]
+
+        # _chunks[p][k][v]: abstract bits of pattern p for the value v of
+        # state bits 8k..8k+7, so projecting a state costs one lookup per
+        # byte plus one popcount for the other items
+        position = {name: i for i, name in enumerate(puzzle.names)}
+        chunk_count = (len(puzzle.names) + 7) // 8
+        self._chunks = []
+        self._others = []  # (mask of the items outside pattern p, shift of their count)
+        for pattern in self.patterns:
+            kept = sum(1 << position[name] for name in pattern)
+            self._others.append((puzzle._item_mask & ~kept, len(pattern) + 1))
+            abstract_bit = {0: 1}  # The farmer is bit 0 in every abstraction
+            for j, name in enumerate(pattern, 1):
+                abstract_bit[position[name]] = 1 << j
+            chunks = []
+            for k in range(chunk_count):
+                chunk = [0] * 256
+                for value in range(256):
+                    for bit in range(8):
+                        if value >> bit & 1:
+                            chunk[value] |= abstract_bit.get(8 * k + bit, 0)
+                chunks.append(chunk)
+            self._chunks.append(chunks)
+
+    def project(self, state, p):
+        """Index of state in the table of pattern p."""
+        others, shift = self._others[p]
+        index = bin(state & others).count("1") << shift
+        for chunk in self._chunks[p]:
+            index |= chunk[state & 255]
+            state >>= 8
+        return index
+
+    def __call__(self, state):
+        """Admissible heuristic: max of the pattern distances and the puzzle's own bound."""
+        best = self.puzzle.heuristic(state)
+        for p, table in enumerate(self.tables):
+            distance = table[self.project(state, p)]
+            if distance == UNREACHABLE:
+                return float("inf")  # No abstract solution, so no real one
+            if distance > best:
+                best = distance
+        return best
+
+    def spec(self):
+        return {"puzzle": self.puzzle.spec(), "patterns": self.patterns}
+
+    def save(self, filename):
+        """Writes the tables to filename (atomically, like checkpoint.py)."""
+        spec = json.dumps(self.spec(), sort_keys=True).encode()
+        temp_name = f"{filename}.tmp"
+        with open(temp_name, "wb") as f:
+            f.write(_HEADER.pack(MAGIC, len(spec)))
+            f.write(spec)
+            for table in self.tables:
+                f.write(table)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_name, filename)
+
+    @classmethod
+    def load(cls, filename, puzzle):
+        """Reads tables written by save(); raises ValueError unless they fit puzzle exactly."""
+        with open(filename, "rb") as f:
+            header = f.read(_HEADER.size)
+            if len(header) != _HEADER.size:
+                raise ValueError(f"{filename} is not a pattern database")
+            magic, spec_length = _HEADER.unpack(header)
+            if magic != MAGIC:
+                raise ValueError(f"{filename} is not a pattern database")
+            spec = json.loads(f.read(spec_length))
+            if not isinstance(spec, dict) or spec.get("puzzle") != puzzle.spec():
+                raise ValueError(f"{filename} was built for a different puzzle")
+            patterns = spec.get("patterns")
+            if not isinstance(patterns, list) or not all(
+                    isinstance(pattern, list) and len(set(pattern)) == len(pattern)
+                    and set(pattern) <= set(puzzle.items) for pattern in patterns):
+                raise ValueError(f"{filename} has malformed patterns")
+            tables = []
+            for pattern in patterns:
+                size = (len(puzzle.items) - len(pattern) + 1) << (len(pattern) + 1)
+                table = bytearray(f.read(size))
+                if len(table) != size or table[-1] != 0:  # The goal is the last abstract state
+                    raise ValueError(f"{filename} is truncated or damaged")
+                tables.append(table)
+            if f.read(1):
+                raise ValueError(f"{filename} has data after its tables")
+        return cls(puzzle, patterns, tables)
+
+
+def load_or_build(puzzle, filename, patterns=None):
+    """Loads the pattern database from filename, building and saving it the first time."""
+    if os.path.exists(filename):
+        try:
+            database = PatternDatabase.load(filename, puzzle)
+            if patterns is None or database.patterns == [list(p) for p in patterns]:
+                return database
+        except ValueError:
+            pass  # Stale file from another puzzle: rebuild it
+    database = PatternDatabase(puzzle, patterns)
+    database.save(filename)
+    return database
+
+
+if __name__ == "__main__":
+    import tempfile
+    import time
+
+    from search import astar
+
+    class CountingPuzzle:
+        """Counts expansions of the wrapped puzzle."""
+
+        def __init__(self, puzzle):
+            self.puzzle = puzzle
+            self.START_STATE, self.GOAL_STATE = puzzle.START_STATE, puzzle.GOAL_STATE
+            self.heuristic = puzzle.heuristic
+            self.expanded = 0
+
+        def next_states(self, state):
+            self.expanded += 1
+            return self.puzzle.next_states(state)
+
+    # A 16-item instance where the eats-rules force detours: the simple
+    # bound says 7 crossings, the real answer is 11
+    items = [f"Item{i}" for i in range(16)]
+    eats = [(1, 14), (1, 4), (10, 5), (11, 9), (10, 9), (6, 7), (10, 11), (0, 7), (5, 7), (10, 4), (10, 15)]
+    puzzle = RiverPuzzle(items=items, eats=[(items[a], items[b]) for a, b in eats], boat_capacity=4)
+    filename = os.path.join(tempfile.gettempdir(), "river16.pdb")
+    if os.path.exists(filename):
+        os.remove(filename)
+
+    t0 = time.perf_counter()
+    database = load_or_build(puzzle, filename)
+    print(f"Built {len(database.patterns)} patterns of {[len(p) for p in database.patterns]} items "
+          f"in {time.perf_counter() - t0:.2f} s ({os.path.getsize(filename)} bytes)")
+    t0 = time.perf_counter()
+    database = load_or_build(puzzle, filename)
+    print(f"Loaded them again in {(time.perf_counter() - t0) * 1000:.1f} ms")
+
+    for name, heuristic in (("Simple heuristic", None), ("Pattern databases", database)):
+        counting = CountingPuzzle(puzzle)
+        t0 = time.perf_counter()
+        path = astar(counting, heuristic)
+        print(f"{name}: {len(path) - 1} steps, {counting.expanded} expansions, "
+              f"{time.perf_counter() - t0:.2f} s")
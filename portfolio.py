@@ -0,0 +1,121 @@
+import json
+import logging
+import multiprocessing
+import queue
+import time
+from collections import Counter, defaultdict
+
+from puzzle_specs import puzzle_from_spec
+from search import STRATEGIES
+
+logger = logging.getLogger(__name__)
+
+
+# --- Portfolio solver ---
+# Races several optimal search strategies in separate processes and keeps
+# the first answer.  Every strategy is optimal, so the first answer is an
+# optimal one.  The losers are terminated, and the winner is logged per
+# puzzle configuration so the default strategy can be tuned from data.
+
+def _race(name, puzzle, results):
+    start = time.perf_counter()
+    try:
+        path = STRATEGIES[name](puzzle)
+    except Exception as e:  # A crashed strategy just drops out of the race
+        results.put((name, None, time.perf_counter() - start, f"{type(e).__name__}: {e}"))
+        return
+    results.put((name, path, time.perf_counter() - start, None))
+
+
+def configuration(puzzle):
+    """A short description of the puzzle's shape, used to group log records."""
+    spec = puzzle.spec()
+    if spec["type"] == "river":
+        return f"river/items={len(spec['items'])}/eats={len(spec['eats'])}/boat={spec['boat_capacity']}"
+    return f"mc/m={spec['missionaries']}/c={spec['cannibals']}/boat={spec['boat_capacity']}"
+
+
+def solve_portfolio(puzzle, strategies=("bfs", "bidirectional", "astar"), timeout=None, log_path=None):
+    """
+    Solves a puzzle (object or spec dict) with the first strategy to finish.
+    Returns (winner, path); winner is None if every strategy failed or the
+    timeout expired.  Results are appended to log_path as NDJSON records.
+    """
+    if isinstance(puzzle, dict):
+        puzzle = puzzle_from_spec(puzzle)
+    context = multiprocessing.get_context()
+    results = context.Queue()
+    workers = [context.Process(target=_race, args=(name, puzzle, results), daemon=True)
+               for name in strategies]
+    start = time.perf_counter()
+    for worker in workers:
+        worker.start()
+
+    winner, path, errors = None, None, {}
+    deadline = None if timeout is None else start + timeout
+    try:
+        for _ in workers:
+            remaining = None if deadline is None else max(0, deadline - time.perf_counter())
+            name, result, _, error = results.get(timeout=remaining)
+            if error is None:
+                winner, path = name, result
+                break
+            errors[name] = error
+    except queue.Empty:
+        pass
+    finally:
+        for worker in workers:
+            if worker.is_alive():
+                worker.terminate()
+        for worker in workers:
+            worker.join()
+        results.close()
+
+    record = {
+        "configuration": configuration(puzzle),
+        "spec": puzzle.spec(),
+        "winner": winner,
+        "steps": len(path) - 1 if path else None,
+        "elapsed": time.perf_counter() - start,
+        "strategies": list(strategies),
+    }
+    if errors:
+        record["errors"] = errors
+    logger.info("portfolio winner %s for %s in %.3f s", winner, record["configuration"], record["elapsed"])
+    if log_path is not None:
+        with open(log_path, "a", encoding="utf-8") as log:
+            log.write(json.dumps(record) + "\n")
+    return winner, path
+
+
+def summarize_log(log_path):
+    """Counts wins per strategy for every configuration in a portfolio log."""
+    wins = defaultdict(Counter)
+    with open(log_path, encoding="utf-8") as log:
+        for line in log:
+            record = json.loads(line)
+            wins[record["configuration"]][record["winner"]] += 1
+    return dict(wins)
+
+
+if __name__ == "__main__":
+    import os
+    import tempfile
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    log_path = os.path.join(tempfile.gettempdir(), "portfolio_wins.ndjson")
+    specs = [
+        {"type": "mc", "missionaries": 3, "cannibals": 3, "boat_capacity": 2},
+        {"type": "mc", "missionaries": 60, "cannibals": 60, "boat_capacity": 4},
+        {"type": "river"},
+        {"type": "river", "items": [f"Item{i}" for i in range(14)],
+         "eats": [[f"Item{i}", f"Item{i + 1}"] for i in range(0, 12, 4)], "boat_capacity": 3},
+    ]
+    for spec in specs:
+        winner, path = solve_portfolio(spec, log_path=log_path)
+        steps = f"{len(path) - 1} steps" if path else "no solution"
+        print(f"{spec['type']}: {winner} won ({steps})")
+
+    print(f"\nWins per configuration ({log_path}):")
+    for config, wins in summarize_log(log_path).items():
+        print(f"  {config}: {dict(wins)}")
@@ -0,0 +1,115 @@
+import argparse
+import asyncio
+import json
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+
+from puzzle_specs import solve_spec, spec_key
+
+
+# --- Asyncio puzzle-solving service ---
+# Protocol: line-delimited JSON over TCP.  Each request line is
+#   {"id": <anything>, "puzzle": <spec>}
+# and gets one response line, in completion order:
+#   {"id": ..., "result": {...}, "cached": bool, "coalesced": bool}
+#   {"id": ..., "error": "..."}
+# Searches run in a process pool so the event loop never blocks.  Identical
+# in-flight requests share one search, and finished results are kept in a
+# bounded LRU cache.
+
+class PuzzleService:
+    def __init__(self, workers=None, cache_size=1024):
+        self.cache_size = cache_size
+        self.stats = {"requests": 0, "cache_hits": 0, "coalesced": 0, "searches": 0, "errors": 0}
+        self._executor = ProcessPoolExecutor(workers)
+        self._in_flight = {}
+        self._cache = OrderedDict()
+
+    async def solve(self, spec):
+        """Returns (result, cached, coalesced) for a puzzle spec."""
+        self.stats["requests"] += 1
+        key = spec_key(spec)
+
+        result = self._cache.get(key)
+        if result is not None:
+            self._cache.move_to_end(key)
+            self.stats["cache_hits"] += 1
+            return result, True, False
+
+        future = self._in_flight.get(key)
+        coalesced = future is not None
+        if coalesced:
+            self.stats["coalesced"] += 1
+        else:
+            self.stats["searches"] += 1
+            future = asyncio.get_running_loop().run_in_executor(self._executor, solve_spec, spec)
+            self._in_flight[key] = future
+            future.add_done_callback(lambda f: self._finish(key, f))
+
+        # Shielded so one cancelled client does not cancel the shared search
+        return await asyncio.shield(future), False, coalesced
+
+    def _finish(self, key, future):
+        del self._in_flight[key]
+        if future.cancelled() or future.exception() is not None:
+            return
+        self._cache[key] = future.result()
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+    async def _answer(self, line, writer):
+        request_id = None
+        try:
+            request = json.loads(line)
+            request_id = request.get("id")
+            result, cached, coalesced = await self.solve(request.get("puzzle", {}))
+            response = {"id": request_id, "result": result, "cached": cached, "coalesced": coalesced}
+        except Exception as e:  # Report bad requests to the client, keep serving
+            self.stats["errors"] += 1
+            response = {"id": request_id, "error": f"{type(e).__name__}: {e}"}
+        writer.write(json.dumps(response).encode() + b"\n")
+        await writer.drain()
+
+    async def handle_client(self, reader, writer):
+        pending = set()
+        try:
+            while line := await reader.readline():
+                if not line.strip():
+                    continue
+                task = asyncio.create_task(self._answer(line, writer))
+                pending.add(task)
+                task.add_done_callback(pending.discard)
+            if pending:
+                await asyncio.wait(pending)
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    def close(self):
+        self._executor.shutdown(cancel_futures=True)
+
+
+async def serve(host="127.0.0.1", port=8765, workers=None, cache_size=1024):
+    service = PuzzleService(workers, cache_size)
+    server = await asyncio.start_server(service.handle_client, host, port, limit=1 << 20)
+    print(f"Puzzle service listening on {host}:{port}")
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        service.close()
+        print(f"Service stats: {service.stats}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Line-delimited JSON puzzle-solving service")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--workers", type=int, default=None, help="solver processes (default: CPU count)")
+    parser.add_argument("--cache-size", type=int, default=1024)
+    args = parser.parse_args()
+    try:
+        asyncio.run(serve(args.host, args.port, args.workers, args.cache_size))
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,65 @@
+import json
+import time
+
+from mc_puzzle import MissionariesCannibalsPuzzle
+from river_puzzle import RiverPuzzle
+
+
+# --- Puzzle definitions as plain JSON-friendly dicts ---
+# {"type": "river", "items": [...], "eats": [[eater, eaten], ...], "boat_capacity": 1}
+# {"type": "mc", "missionaries": 3, "cannibals": 3, "boat_capacity": 2,
+#  "boat_rules": ["missionaries_not_outnumbered"]}
+# Missing fields fall back to the classic puzzles.
+
+def puzzle_from_spec(spec):
+    """Builds a puzzle object from a spec dict; raises ValueError if it is malformed."""
+    if not isinstance(spec, dict):
+        raise ValueError("a puzzle spec must be a JSON object")
+    kind = spec.get("type", "river")
+    try:
+        if kind == "river":
+            defaults = RiverPuzzle()
+            return RiverPuzzle(items=spec.get("items", defaults.items),
+                               eats=spec.get("eats", defaults.eats),
+                               boat_capacity=int(spec.get("boat_capacity", 1)))
+        if kind == "mc":
+            return MissionariesCannibalsPuzzle(missionaries=int(spec.get("missionaries", 3)),
+                                               cannibals=int(spec.get("cannibals", 3)),
+                                               boat_capacity=int(spec.get("boat_capacity", 2)),
+                                               boat_rules=spec.get("boat_rules", ()))
+    except (KeyError, TypeError) as e:
+        raise ValueError(f"invalid {kind} puzzle spec: {e}") from None
+    raise ValueError(f"unknown puzzle type: {kind!r}")
+
+
+def spec_key(spec):
+    """Canonical string for a spec, so equivalent requests share one search."""
+    return json.dumps(puzzle_from_spec(spec).spec(), sort_keys=True, separators=(",", ":"))
+
+
+def state_to_json(state):
+    return list(state) if isinstance(state, tuple) else state
+
+
+def solve_spec(spec, timeout=None):
+    """
+    Solves a spec and returns a JSON-friendly result dict.  With a timeout
+    (seconds) the search gives up and reports status "timeout".
+    """
+    puzzle = puzzle_from_spec(spec)
+    start = time.perf_counter()
+    if timeout is None:
+        path = puzzle.solve()
+        status = "solved" if path is not None else "no_solution"
+    else:
+        result = puzzle.solve_with_budget(deadline=time.monotonic() + timeout)
+        path, status = result.path, result.status
+    elapsed = time.perf_counter() - start
+    return {
+        "spec": puzzle.spec(),
+        "status": status,
+        "solved": path is not None,
+        "steps": len(path) - 1 if path else None,
+        "path": [state_to_json(state) for state in path] if path else None,
+        "elapsed": elapsed,
+    }
@@ -0,0 +1,183 @@
+import sys
+from collections import deque
+from itertools import combinations
+
+from search import bounded_bfs
+from state_labels import StateLabelTable, decode_state, encode_state
+
+# Field names for TraceBuffer records written by print_solution()
+SOLUTION_TRACE_FIELDS = ("step", "state")
+
+
+# --- Generalized river crossing (any number of items) ---
+# The classic puzzle is RiverPuzzle(): a farmer, a wolf, a duck and corn.
+# A state is an integer: bit 0 is the farmer and bit i is items[i - 1];
+# a set bit means that entity is on the North bank.  The farmer rows the
+# boat and can take up to boat_capacity items with him.
+
+class RiverPuzzle:
+    def __init__(self, items=("Wolf", "Duck", "Corn"),
+                 eats=(("Wolf", "Duck"), ("Duck", "Corn")), boat_capacity=1):
+        self.items = tuple(items)
+        self.names = ("Farmer",) + self.items
+        self.eats = tuple((eater, eaten) for eater, eaten in eats)
+        self.boat_capacity = boat_capacity
+
+        bit = {name: 1 << i for i, name in enumerate(self.names)}
+        self._eat_masks = tuple(bit[eater] | bit[eaten] for eater, eaten in self.eats)
+        self._item_bits = tuple(bit[name] for name in self.items)
+        self._item_mask = sum(self._item_bits)
+
+        self.START_STATE = 0
+        self.GOAL_STATE = (1 << len(self.names)) - 1
+        self._labels = None
+
+    def spec(self):
+        return {"type": "river", "items": list(self.items),
+                "eats": [list(pair) for pair in self.eats], "boat_capacity": self.boat_capacity}
+
+    def encode(self, state):
+        """States are already integers."""
+        return state
+
+    def decode(self, code):
+        return code
+
+    def is_valid(self, state):
+        """Checks that no eater is left alone with what it eats."""
+        farmer_north = state & 1
+        for pair in self._eat_masks:
+            together = state & pair
+            if together == 0 and farmer_north:
+                return False  # Both on South, farmer on North
+            if together == pair and not farmer_north:
+                return False  # Both on North, farmer on South
+        return True
+
+    def next_states(self, state):
+        """
+        Yields all valid states reachable with one crossing.  The items left
+        behind are alone on the farmer's old bank, so is_valid() comes down
+        to checking that no eat pair is among them.
+        """
+        if state & 1:
+            same_bank = state & self._item_mask
+        else:
+            same_bank = ~state & self._item_mask
+        movable = [b for b in self._item_bits if same_bank & b]
+        eat_masks = self._eat_masks
+
+        for count in range(min(self.boat_capacity, len(movable)) + 1):
+            for cargo in combinations(movable, count):
+                cargo = sum(cargo)
+                left_behind = same_bank ^ cargo
+                for pair in eat_masks:
+                    if left_behind & pair == pair:
+                        break
+                else:
+                    yield state ^ 1 ^ cargo
+
+    def heuristic(self, state):
+        """
+        Admissible estimate of the crossings left: every round trip moves at
+        most boat_capacity items to the North bank.
+        """
+        south_items = bin(~state & self._item_mask).count("1")
+        trips = -(-south_items // self.boat_capacity)  # Ceiling division
+        if state & 1:
+            return 2 * trips  # The farmer has to come back first
+        return max(1, 2 * trips - 1)
+
+    def solve(self):
+        """
+        Solves the puzzle with Breadth-First Search.
+        Returns the shortest list of states from start to goal, or None.
+        """
+        parents = {self.START_STATE: None}
+        queue = deque([self.START_STATE])
+
+        while queue:
+            state = queue.popleft()
+            if state == self.GOAL_STATE:
+                return self._path_to(state, parents)
+            for next_state in self.next_states(state):
+                if next_state not in parents:
+                    parents[next_state] = state
+                    queue.append(next_state)
+        return None
+
+    def solve_with_budget(self, deadline=None, progress=None):
+        """
+        BFS that stops at a deadline (a time.monotonic() timestamp) or when
+        the progress callback (called with a search.LayerEvent per layer)
+        returns False.  Always returns a search.SearchResult, holding
+        counters and the best partial path if the search stopped early.
+        """
+        return bounded_bfs(self, deadline, progress=progress)
+
+    def _path_to(self, state, parents):
+        path = []
+        while state is not None:
+            path.append(state)
+            state = parents[state]
+        path.reverse()
+        return path
+
+    # --- Conversions to / from lab1-style ('S', 'N', ...) tuples ---
+
+    def to_tuple(self, state):
+        return decode_state(state, len(self.names))
+
+    def from_tuple(self, state):
+        return encode_state(state)
+
+    # --- Output ---
+
+    def format_state(self, state):
+        if self._labels is None:
+            self._labels = StateLabelTable(self.names)
+        return self._labels.label(state)
+
+    def describe_move(self, prev_state, curr_state):
+        moved = [name for i, name in enumerate(self.items, 1) if (prev_state ^ curr_state) >> i & 1]
+        direction = "(South → North)" if curr_state & 1 else "(North → South)"
+        if not moved:
+            return f"Farmer crosses alone {direction}"
+        return f"Farmer takes the {' and the '.join(moved)} {direction}"
+
+    def print_solution(self, path, trace=None, out=None):
+        """
+        Prints the solution path with a single buffered write.
+        With a TraceBuffer nothing is printed: each step is recorded as a
+        SOLUTION_TRACE_FIELDS tuple instead.
+        """
+        if trace is not None:
+            for i, state in enumerate(path or ()):
+                trace.append((i, state))
+            return
+
+        if not path:
+            (out or sys.stdout).write("No solution found.\n")
+            return
+
+        format_state = self.format_state
+        lines = [f"✅ Solution Found in {len(path) - 1} steps!\n",
+                 f"Step 0 (Start): {format_state(path[0])}"]
+        for i in range(1, len(path)):
+            lines.append(f"\nStep {i}: {self.describe_move(path[i - 1], path[i])}")
+            lines.append(f"       Result: {format_state(path[i])}")
+        (out or sys.stdout).write("\n".join(lines) + "\n")
+
+
+if __name__ == "__main__":
+    print("=" * 50)
+    print("CLASSIC RIVER PUZZLE")
+    puzzle = RiverPuzzle()
+    puzzle.print_solution(puzzle.solve())
+
+    print("\n" + "=" * 50)
+    print("GENERALIZED: TWO WOLVES, A DUCK, CORN, BOAT FOR TWO")
+    puzzle = RiverPuzzle(items=("Wolf1", "Wolf2", "Duck", "Corn"),
+                         eats=(("Wolf1", "Duck"), ("Wolf2", "Duck"), ("Duck", "Corn")),
+                         boat_capacity=2)
+    puzzle.print_solution(puzzle.solve())
@@ -0,0 +1,350 @@
+import time
+from functools import lru_cache
+from itertools import accumulate, islice, repeat
+from operator import add, sub
+
+from lab1 import UtilityBasedDeliveryAgent, WorldState
+
+
+# --- Route planning for many pickup/delivery requests ---
+# A request is a (pickup, delivery) pair of cells.  The agent can carry any
+# number of packages, so a route is an order of all 2n stops in which every
+# pickup comes before its delivery; its cost is the distance walked from
+# the start (the route ends at the last delivery).
+#   - Up to exact_limit requests, held_karp() finds an optimal route by
+#     dynamic programming over (picked-up set, delivered set, last stop),
+#     memoized, which is O(3^n * n^2) instead of O((2n)!).
+#   - Above it, insertion_route() inserts the requests one by one at their
+#     cheapest place in O(route length) each, so O(n^2) in all, and
+#     two_opt() then reverses segments that shorten the route, skipping any
+#     segment that contains both stops of a request (reversing it would
+#     deliver before pickup).  A time budget covers both phases: requests
+#     not inserted by the deadline are appended by sweep_route(), which
+#     sweeps their stops in cell order, out and back, in O(n log n).
+# Stops are (request index, "pickup" or "deliver", cell) tuples.
+
+PICKUP, DELIVER = "pickup", "deliver"
+
+
+def line_distance(a, b):
+    return abs(a - b)
+
+
+class RoutePlan:
+    def __init__(self, stops, cost, method, elapsed):
+        self.stops = stops
+        self.cost = cost
+        self.method = method
+        self.elapsed = elapsed
+
+    def __len__(self):
+        return len(self.stops)
+
+    def __repr__(self):
+        return f"RoutePlan({len(self.stops)} stops, cost={self.cost}, method={self.method!r})"
+
+
+def route_cost(start, stops, distance=line_distance):
+    cost, here = 0, start
+    for _, _, cell in stops:
+        cost += distance(here, cell)
+        here = cell
+    return cost
+
+
+def held_karp(start, requests, distance=line_distance):
+    """Optimal route for a handful of requests; returns the list of stops."""
+    n = len(requests)
+    everyone = (1 << n) - 1
+    cells = [cell for request in requests for cell in request]  # Stop 2r: pickup, 2r + 1: delivery
+
+    def cell_of(last):
+        return start if last < 0 else cells[last]
+
+    @lru_cache(maxsize=None)
+    def finish(picked, delivered, last):
+        """(cost to serve everything left, next stop) from stop `last`."""
+        if delivered == everyone:
+            return 0, None
+        here = cell_of(last)
+        best = (float("inf"), None)
+        for r in range(n):
+            bit = 1 << r
+            if not picked & bit:
+                stop, state = 2 * r, (picked | bit, delivered)
+            elif not delivered & bit:
+                stop, state = 2 * r + 1, (picked, delivered | bit)
+            else:
+                continue
+            cost = distance(here, cells[stop]) + finish(*state, stop)[0]
+            if cost < best[0]:
+                best = (cost, stop)
+        return best
+
+    stops, picked, delivered, last = [], 0, 0, -1
+    while True:
+        stop = finish(picked, delivered, last)[1]
+        if stop is None:
+            break
+        r, kind = divmod(stop, 2)
+        if kind:
+            delivered |= 1 << r
+        else:
+            picked |= 1 << r
+        stops.append((r, DELIVER if kind else PICKUP, cells[stop]))
+        last = stop
+    finish.cache_clear()
+    return stops
+
+
+def sweep_route(start, requests, distance=line_distance, first=0):
+    """
+    Route for requests[first:] in two sweeps over their stops in cell
+    order: every pickup, and every delivery whose pickup is already done,
+    on the way out; the other deliveries on the way back.  Both directions
+    are tried and the cheaper route is returned.
+    """
+    stops = sorted(((r, kind, cell) for r in range(first, len(requests))
+                    for kind, cell in zip((PICKUP, DELIVER), requests[r])),
+                   key=lambda stop: (stop[2], stop[1] == DELIVER))
+    best = None
+    for sweep in (stops, stops[::-1]):
+        route, picked, back = [], set(), []
+        for stop in sweep:
+            if stop[1] == PICKUP:
+                picked.add(stop[0])
+                route.append(stop)
+            elif stop[0] in picked:
+                route.append(stop)
+            else:
+                back.append(stop)
+        route.extend(reversed(back))
+        cost = route_cost(start, route, distance)
+        if best is None or cost < best[0]:
+            best = (cost, route)
+    return best[1]
+
+
+def insertion_route(start, requests, distance=line_distance, deadline=None):
+    """
+    Cheapest-insertion route, one request at a time; returns the list of
+    stops.  distance must be symmetric.  After the time.monotonic()
+    deadline the remaining requests are appended by sweep_route(), unless
+    sweeping all of them is cheaper.
+    """
+    route = []
+    points = [start]  # The start, then the cells of the route
+    edges = []  # edges[k]: distance(points[k], points[k + 1])
+
+    def insert(gap, cell):
+        # Gap k is between points[k] and points[k + 1] (nothing after the last gap)
+        if gap < len(edges):
+            edges[gap:gap + 1] = [distance(points[gap], cell), distance(cell, points[gap + 1])]
+        else:
+            edges.append(distance(points[gap], cell))
+        points.insert(gap + 1, cell)
+
+    for r, (pickup, delivery) in enumerate(requests):
+        if deadline is not None and time.monotonic() >= deadline:
+            route.extend(sweep_route(points[-1], requests, distance, r))
+            # Two sweeps after a partial route can cost more than sweeping everything
+            whole = sweep_route(start, requests, distance)
+            if route_cost(start, whole, distance) < route_cost(start, route, distance):
+                return whole
+            break
+        # Distances from every point, then the added length of each gap
+        to_pickup = list(map(distance, points, repeat(pickup)))
+        to_delivery = list(map(distance, points, repeat(delivery)))
+        pickup_cost = list(map(sub, map(add, to_pickup, islice(to_pickup, 1, None)), edges))
+        pickup_cost.append(to_pickup[-1])
+        delivery_cost = list(map(sub, map(add, to_delivery, islice(to_delivery, 1, None)), edges))
+        delivery_cost.append(to_delivery[-1])
+        # Both stops in one gap: point -> pickup -> delivery -> next point
+        same_gap = list(map(sub, map(add, to_pickup, islice(to_delivery, 1, None)), edges))
+        same_gap.append(to_pickup[-1])
+        i = j = min(range(len(same_gap)), key=same_gap.__getitem__)
+        best = same_gap[i] + distance(pickup, delivery)
+        # Delivery in a later gap: add the cheapest delivery gap after each pickup gap
+        later = list(accumulate(reversed(delivery_cost), min))
+        later.reverse()
+        split = list(map(add, pickup_cost, islice(later, 1, None)))
+        if split:
+            k = min(range(len(split)), key=split.__getitem__)
+            if split[k] < best:
+                i = k
+                j = min(range(k + 1, len(delivery_cost)), key=delivery_cost.__getitem__)
+
+        # Insert the delivery first so the pickup's gap index stays valid
+        insert(j, delivery)
+        insert(i, pickup)
+        route.insert(j, (r, DELIVER, delivery))
+        route.insert(i, (r, PICKUP, pickup))
+    return route
+
+
+def two_opt(start, stops, distance=line_distance, window=None, deadline=None):
+    """
+    Improves a route in place by reversing segments of at most `window`
+    stops while that shortens it; stops at the time.monotonic() deadline.
+    Returns the route.
+    """
+    n = len(stops)
+    window = window or n
+    improved = True
+    while improved:
+        improved = False
+        for i in range(n - 1):
+            if deadline is not None and time.monotonic() >= deadline:
+                return stops
+            prev = start if i == 0 else stops[i - 1][2]
+            first = stops[i][2]
+            leave_first = distance(prev, first)
+            inside = {stops[i][0]}
+            for j in range(i + 1, min(n, i + window)):
+                request = stops[j][0]
+                if request in inside:
+                    break  # Both stops of a request in the segment, here and for every longer one
+                inside.add(request)
+                last = stops[j][2]
+                if j + 1 < n:
+                    nxt = stops[j + 1][2]
+                    delta = distance(prev, last) + distance(first, nxt) - leave_first - distance(last, nxt)
+                else:
+                    delta = distance(prev, last) - leave_first
+                if delta < 0:
+                    stops[i:j + 1] = stops[i:j + 1][::-1]
+                    improved = True
+                    first = stops[i][2]
+                    leave_first = distance(prev, first)
+    return stops
+
+
+def plan_route(start, requests, distance=line_distance, exact_limit=7, window=64, time_budget=None):
+    """
+    Plans a route for all requests: exact up to exact_limit requests,
+    insertion + 2-opt above it, within time_budget seconds if given (the
+    insertion alone is O(n^2) and takes seconds for thousands of requests).
+    """
+    started = time.perf_counter()
+    if len(requests) <= exact_limit:
+        stops, method = held_karp(start, requests, distance), "held-karp"
+    else:
+        deadline = None if time_budget is None else time.monotonic() + time_budget
+        stops = two_opt(start, insertion_route(start, requests, distance, deadline), distance, window, deadline)
+        method = "insertion+2-opt"
+    return RoutePlan(stops, route_cost(start, stops, distance), method, time.perf_counter() - started)
+
+
+# --- Agent that follows a planned route ---
+
+class MultiDeliveryWorldState(WorldState):
+    """A line world with several (pickup, delivery) requests."""
+
+    def __init__(self, requests):
+        self.requests = list(requests)
+        if not self.requests:
+            raise ValueError("a delivery world needs at least one request")
+        # The first request doubles as the single-package view of the base class
+        super().__init__(*self.requests[0])
+
+    def distance(self, a, b):
+        return abs(a - b)
+
+
+class PlannedDeliveryAgent(UtilityBasedDeliveryAgent):
+    def __init__(self, bounds=(0, 10), exact_limit=7, time_budget=None):
+        super().__init__(bounds=bounds)
+        self.exact_limit = exact_limit
+        self.time_budget = time_budget
+        self.plan = None
+        self.carrying = set()
+        self._next_stop = 0
+
+    def perceive(self, world_state):
+        """Perceive the environment and plan a route for a new world"""
+        if world_state is not self.world or self.plan is None:
+            low, high = self.bounds
+            if not all(low <= cell <= high for request in world_state.requests for cell in request):
+                raise ValueError(f"every request must lie within the bounds {self.bounds}")
+            self.plan = plan_route(self.position, world_state.requests, world_state.distance, self.exact_limit,
+                                   time_budget=self.time_budget)
+            self._next_stop = 0
+            self.carrying = set()
+            self.package_delivered = False
+        super().perceive(world_state)
+
+    def act(self):
+        """Walk to the next stop of the plan, then pick up or deliver there"""
+        stops = self.plan.stops
+        if self._next_stop == len(stops):
+            return "wait", self.WAIT_UTILITY  # Everything is delivered
+        request, kind, cell = stops[self._next_stop]
+        if self.position < cell:
+            self.position += 1
+            return "move_right", -self.MOVE_COST
+        if self.position > cell:
+            self.position -= 1
+            return "move_left", -self.MOVE_COST
+
+        self._next_stop += 1
+        if kind == PICKUP:
+            self.carrying.add(request)
+            self.has_package = True
+            return "pickup_package", self.PICKUP_REWARD
+        self.carrying.discard(request)
+        self.has_package = bool(self.carrying)
+        self.package_delivered = self._next_stop == len(stops)
+        return "package_delivered", self.DELIVERY_REWARD
+
+
+# --- Benchmark ---
+
+def line_lower_bound(start, requests):
+    """No route on a line can be shorter than reaching both ends of the span."""
+    cells = [cell for request in requests for cell in request]
+    low, high = min(cells + [start]), max(cells + [start])
+    return high - low + min(start - low, high - start)
+
+
+if __name__ == "__main__":
+    import random
+
+    world = MultiDeliveryWorldState([(3, 6), (8, 1), (5, 9)])
+    agent = PlannedDeliveryAgent()
+    agent.perceive(world)
+    print(f"Plan for {world.requests}: {[(kind, cell) for _, kind, cell in agent.plan.stops]}, "
+          f"cost {agent.plan.cost}")
+    agent.run(world, max_steps=40)
+
+    rng = random.Random(0)
+    print("\nrequests  method            plan ms      cost   vs optimal / lower bound   serve-in-order")
+    for count in (5, 7, 50, 500, 5000):
+        length = 100 * count
+        requests = [(rng.randrange(length), rng.randrange(length)) for _ in range(count)]
+        start = rng.randrange(length)
+        plan = plan_route(start, requests, time_budget=30)
+        naive = route_cost(start, [(r, kind, cell) for r, request in enumerate(requests)
+                                   for kind, cell in zip((PICKUP, DELIVER), request)])
+        if count <= 7:
+            reference = "optimal (exact)"
+        else:
+            reference = f"{plan.cost / line_lower_bound(start, requests):.3f} x lower bound"
+        print(f"{count:>8}  {plan.method:<16}{plan.elapsed * 1000:>9.1f}{plan.cost:>10}   {reference:<27}{naive:>14}")
+
+    # A budget shorter than the insertion phase still yields a complete route
+    plan = plan_route(start, requests, time_budget=0.5)
+    served = sorted(stop[:2] for stop in plan.stops)
+    assert served == sorted((r, kind) for r in range(count) for kind in (PICKUP, DELIVER))
+    assert plan.cost < 2 * line_lower_bound(start, requests)  # Not just the requests in input order
+    print(f"\n{count} requests with a 0.5 s budget: planned in {plan.elapsed * 1000:.1f} ms, cost {plan.cost}")
+
+    # Heuristic quality where the optimum is known
+    gaps = []
+    for _ in range(50):
+        requests = [(rng.randrange(200), rng.randrange(200)) for _ in range(6)]
+        start = rng.randrange(200)
+        exact = plan_route(start, requests).cost
+        heuristic = plan_route(start, requests, exact_limit=0).cost
+        gaps.append(heuristic / exact - 1 if exact else 0.0)
+    print(f"\ninsertion+2-opt on 50 random 6-request instances: mean gap {sum(gaps) / len(gaps):.2%}, "
+          f"worst {max(gaps):.2%}, optimal in {sum(gap == 0 for gap in gaps)}")
@@ -0,0 +1,63 @@
+import json
+
+
+# --- Fixed-size ring buffer for run traces ---
+# Recording a step only stores a tuple in a preallocated slot: no string
+# formatting and no I/O happen inside the agent / solver loops.  The text
+# or NDJSON rendering is built on demand and written in one call.
+
+class TraceBuffer:
+    def __init__(self, capacity=1024, fields=None):
+        if capacity < 1:
+            raise ValueError(f"capacity must be at least 1, got {capacity}")
+        self.capacity = capacity
+        self.fields = tuple(fields) if fields else None
+        self.recorded = 0  # Total records ever appended (including dropped ones)
+        self._slots = [None] * capacity
+
+    def append(self, record):
+        """Stores one record tuple, overwriting the oldest one when full."""
+        self._slots[self.recorded % self.capacity] = record
+        self.recorded += 1
+
+    def clear(self):
+        self.recorded = 0
+        self._slots = [None] * self.capacity
+
+    @property
+    def dropped(self):
+        """How many of the oldest records were overwritten."""
+        return max(0, self.recorded - self.capacity)
+
+    def __len__(self):
+        return min(self.recorded, self.capacity)
+
+    def __iter__(self):
+        """Yields the kept records from oldest to newest."""
+        start = self.recorded % self.capacity if self.recorded > self.capacity else 0
+        for i in range(len(self)):
+            yield self._slots[(start + i) % self.capacity]
+
+    def render_text(self, out=None):
+        """Renders one 'field=value' line per record."""
+        if self.fields:
+            lines = [" ".join(f"{name}={value}" for name, value in zip(self.fields, record))
+                     for record in self]
+        else:
+            lines = [" ".join(map(str, record)) for record in self]
+        return self._write(lines, out)
+
+    def render_ndjson(self, out=None):
+        """Renders one JSON object (or array, without field names) per record."""
+        dumps = json.dumps
+        if self.fields:
+            lines = [dumps(dict(zip(self.fields, record)), ensure_ascii=False) for record in self]
+        else:
+            lines = [dumps(record, ensure_ascii=False) for record in self]
+        return self._write(lines, out)
+
+    def _write(self, lines, out):
+        text = "\n".join(lines) + "\n" if lines else ""
+        if out is not None:
+            out.write(text)  # A single buffered write
+        return text
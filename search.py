@@ -0,0 +1,229 @@
+import heapq
+import time
+from collections import namedtuple
+from itertools import count
+
+
+# --- Generic search strategies ---
+# These work on any puzzle object with START_STATE, GOAL_STATE,
+# next_states(state) and heuristic(state) (RiverPuzzle and
+# MissionariesCannibalsPuzzle).  Every strategy returns the shortest list
+# of states from start to goal, or None.
+
+def _path_to(state, parents):
+    path = []
+    while state is not None:
+        path.append(state)
+        state = parents[state]
+    path.reverse()
+    return path
+
+
+def bfs(puzzle):
+    """Breadth-first search, one layer at a time."""
+    start, goal = puzzle.START_STATE, puzzle.GOAL_STATE
+    parents = {start: None}
+    layer = [start]
+
+    while layer:
+        if goal in parents:
+            return _path_to(goal, parents)
+        next_layer = []
+        for state in layer:
+            for next_state in puzzle.next_states(state):
+                if next_state not in parents:
+                    parents[next_state] = state
+                    next_layer.append(next_state)
+        layer = next_layer
+    return None
+
+
+# Progress report emitted after every completed BFS layer.  path is only
+# set on the event that finishes a search with a solution.
+LayerEvent = namedtuple("LayerEvent", "depth frontier visited elapsed path", defaults=(None,))
+
+
+class SearchResult:
+    """
+    Outcome of a bounded search.
+    status is "solved", "no_solution", "timeout" or "aborted" (by a progress
+    callback).  When stopped early, path is None and best_state /
+    partial_path describe the frontier state that looked closest to the
+    goal (lowest heuristic, deepest on ties).
+    """
+
+    def __init__(self, status, path=None, best_state=None, partial_path=None, stats=None):
+        self.status = status
+        self.path = path
+        self.best_state = best_state
+        self.partial_path = partial_path
+        self.stats = stats or {}
+
+    @property
+    def solved(self):
+        return self.status == "solved"
+
+    def __repr__(self):
+        return f"SearchResult(status={self.status!r}, stats={self.stats})"
+
+
+def bounded_bfs(puzzle, deadline=None, check_every=1024, progress=None):
+    """
+    BFS that stops at a deadline (a time.monotonic() timestamp).  The clock
+    is only read every check_every expansions.  progress, if given, is
+    called with a LayerEvent after every layer; returning False aborts the
+    search.  Always returns a SearchResult with the counters of the search.
+    Paths hold the state objects next_states() generated, so any data they
+    carry besides their identity (e.g. parent links) is kept.
+    """
+    start, goal = puzzle.START_STATE, puzzle.GOAL_STATE
+    started = time.monotonic()
+    parents = {start: None}
+    layer = [start]
+    depth = expanded = 0
+    next_check = check_every
+
+    def result(status, path=None, best_state=None):
+        stats = {"expanded": expanded, "visited": len(parents), "depth": depth,
+                 "elapsed": time.monotonic() - started}
+        partial = _path_to(best_state, parents) if best_state is not None else None
+        return SearchResult(status, path, best_state, partial, stats)
+
+    if start == goal:
+        return result("solved", [start])
+
+    while layer:
+        next_layer = []
+        for state in layer:
+            expanded += 1
+            if deadline is not None and expanded >= next_check:
+                next_check += check_every
+                if time.monotonic() >= deadline:
+                    # The first state of a layer is at depth + 1 once generated
+                    frontier = next_layer or layer
+                    best = min(frontier, key=puzzle.heuristic)
+                    if next_layer:
+                        depth += 1
+                    return result("timeout", best_state=best)
+            for next_state in puzzle.next_states(state):
+                if next_state not in parents:
+                    parents[next_state] = state
+                    if next_state == goal:
+                        # BFS generates every state first at its shortest depth
+                        depth += 1
+                        return result("solved", _path_to(next_state, parents))
+                    next_layer.append(next_state)
+        layer = next_layer
+        depth += 1
+        if progress is not None and layer:
+            event = LayerEvent(depth, len(layer), len(parents), time.monotonic() - started)
+            if progress(event) is False:
+                return result("aborted", best_state=min(layer, key=puzzle.heuristic))
+    return result("no_solution")
+
+
+def iter_layers(puzzle):
+    """
+    Runs BFS lazily and yields a LayerEvent after every layer.  The event
+    that finds the goal carries the path; stop iterating to abort.
+    """
+    start, goal = puzzle.START_STATE, puzzle.GOAL_STATE
+    started = time.monotonic()
+    parents = {start: None}
+    layer = [start]
+    depth = 0
+    if start == goal:
+        yield LayerEvent(0, 1, 1, 0.0, [start])
+        return
+
+    while layer:
+        next_layer = []
+        for state in layer:
+            for next_state in puzzle.next_states(state):
+                if next_state not in parents:
+                    parents[next_state] = state
+                    next_layer.append(next_state)
+        layer = next_layer
+        depth += 1
+        path = _path_to(goal, parents) if goal in parents else None
+        yield LayerEvent(depth, len(layer), len(parents), time.monotonic() - started, path)
+        if path is not None:
+            return
+
+
+def bidirectional_bfs(puzzle):
+    """
+    Grows one BFS from the start and one from the goal, always expanding
+    the smaller layer.  Relies on every move being reversible, which holds
+    for both river puzzles.
+    """
+    start, goal = puzzle.START_STATE, puzzle.GOAL_STATE
+    if start == goal:
+        return [start]
+    if not puzzle.is_valid(goal):
+        return None  # Forward search could never enter it either
+    forward, backward = {start: None}, {goal: None}
+    forward_depth, backward_depth = {start: 0}, {goal: 0}
+    forward_layer, backward_layer = [start], [goal]
+
+    while forward_layer and backward_layer:
+        expand_forward = len(forward_layer) <= len(backward_layer)
+        if expand_forward:
+            layer, seen, depth, other_depth = forward_layer, forward, forward_depth, backward_depth
+        else:
+            layer, seen, depth, other_depth = backward_layer, backward, backward_depth, forward_depth
+
+        # Finish the whole layer and keep the meeting point closest to the other side
+        next_layer, meeting = [], None
+        for state in layer:
+            next_depth = depth[state] + 1
+            for next_state in puzzle.next_states(state):
+                if next_state in seen:
+                    continue
+                seen[next_state] = state
+                depth[next_state] = next_depth
+                next_layer.append(next_state)
+                if next_state in other_depth and (
+                        meeting is None or other_depth[next_state] < other_depth[meeting]):
+                    meeting = next_state
+
+        if meeting is not None:
+            path = _path_to(meeting, forward)
+            state = backward[meeting]
+            while state is not None:
+                path.append(state)
+                state = backward[state]
+            return path
+
+        if expand_forward:
+            forward_layer = next_layer
+        else:
+            backward_layer = next_layer
+    return None
+
+
+def astar(puzzle, heuristic=None):
+    """A* search with the puzzle's admissible heuristic."""
+    heuristic = heuristic or puzzle.heuristic
+    start, goal = puzzle.START_STATE, puzzle.GOAL_STATE
+    parents = {start: None}
+    best_cost = {start: 0}
+    tie = count()  # Keeps heap entries comparable without comparing states
+    heap = [(heuristic(start), next(tie), 0, start)]
+
+    while heap:
+        _, _, cost, state = heapq.heappop(heap)
+        if cost > best_cost[state]:
+            continue  # A shorter route to this state was found later
+        if state == goal:
+            return _path_to(state, parents)
+        for next_state in puzzle.next_states(state):
+            next_cost = cost + 1
+            if next_cost < best_cost.get(next_state, next_cost + 1):
+                best_cost[next_state] = next_cost
+                parents[next_state] = state
+                heapq.heappush(heap, (next_cost + heuristic(next_state), next(tie), next_cost, next_state))
+    return None
+
+
+STRATEGIES = {"bfs": bfs, "bidirectional": bidirectional_bfs, "astar": astar}
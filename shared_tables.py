@@ -0,0 +1,211 @@
+import hashlib
+import json
+import os
+import tempfile
+import time
+from array import array
+
+from puzzle_specs import puzzle_from_spec, spec_key
+from state_graph import load_npy, write_npy
+
+
+# --- Precomputed tables shared by many worker processes ---
+# The tables of a puzzle are indexed by puzzle.encode(state):
+#   valid.npy     uint8, 1 if the state is valid
+#   distance.npy  int16, exact crossings to the goal (-1 if unreachable)
+#   moves_*.npy   int8, the boat loads of an M&C puzzle, one file per type
+# They are published once as .npy files in a directory named after the
+# puzzle spec, on the RAM-backed /dev/shm when it exists.  Every worker maps
+# the same files read-only (NumPy arrays or memoryviews, see
+# state_graph.load_npy), so the pages are shared through the page cache:
+# attaching costs no copy, and startup time and memory stay flat however
+# many workers there are.
+
+def _default_root():
+    return "/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir()
+
+
+def table_directory(spec, root=None):
+    digest = hashlib.sha1(spec_key(spec).encode()).hexdigest()[:16]
+    return os.path.join(root or _default_root(), f"puzzle_tables_{digest}")
+
+
+def state_count(puzzle):
+    """Number of integer codes puzzle.encode can produce."""
+    ranker = getattr(puzzle, "ranker", None)
+    if ranker is not None:
+        return len(ranker)
+    return 1 << len(puzzle.names)  # River states are bitmasks
+
+
+def build_tables(puzzle):
+    """Computes the tables of a puzzle; returns {name: array}."""
+    size = state_count(puzzle)
+    decode, encode = puzzle.decode, puzzle.encode
+    valid = array("B", bytes(size))
+    for code in range(size):
+        if puzzle.is_valid(decode(code)):
+            valid[code] = 1
+
+    # Crossings are reversible, so BFS from the goal gives distances to it
+    distance = array("h", [-1]) * size
+    goal = puzzle.GOAL_STATE
+    if puzzle.is_valid(goal):
+        distance[encode(goal)] = 0
+        layer = [goal]
+        depth = 0
+        while layer:
+            depth += 1
+            next_layer = []
+            for state in layer:
+                for next_state in puzzle.next_states(state):
+                    code = encode(next_state)
+                    if distance[code] < 0:
+                        distance[code] = depth
+                        next_layer.append(next_state)
+            layer = next_layer
+
+    tables = {"valid": valid, "distance": distance}
+    moves = getattr(puzzle, "moves", None)
+    if moves is not None:
+        tables["moves_missionaries"] = array("b", [m for m, _ in moves])
+        tables["moves_cannibals"] = array("b", [c for _, c in moves])
+    return tables
+
+
+_TYPECODES = {"valid": "B", "distance": "h", "moves_missionaries": "b", "moves_cannibals": "b"}
+
+
+def publish_tables(spec, root=None):
+    """
+    Builds and writes the tables of a puzzle spec unless they are already
+    published; returns the directory.  Every file is written under a
+    temporary name and renamed into place, so a process publishing the same
+    spec concurrently never truncates a table another one has mapped, and
+    the manifest is renamed last, so a directory without one is never
+    attached.
+    """
+    directory = table_directory(spec, root)
+    manifest_path = os.path.join(directory, "manifest.json")
+    if os.path.exists(manifest_path):
+        return directory
+    puzzle = puzzle_from_spec(spec)
+    os.makedirs(directory, exist_ok=True)
+    tables = build_tables(puzzle)
+    for name, values in tables.items():
+        path = os.path.join(directory, f"{name}.npy")
+        temp_name = f"{path}.{os.getpid()}.tmp"
+        write_npy(temp_name, values, _TYPECODES[name])
+        os.replace(temp_name, path)
+    temp_name = f"{manifest_path}.{os.getpid()}.tmp"
+    with open(temp_name, "w", encoding="utf-8") as f:
+        json.dump({"spec": puzzle.spec(), "tables": sorted(tables)}, f)
+    os.replace(temp_name, manifest_path)
+    return directory
+
+
+class PuzzleTables:
+    """Read-only view of published tables, attached without copying."""
+
+    def __init__(self, directory):
+        with open(os.path.join(directory, "manifest.json"), encoding="utf-8") as f:
+            manifest = json.load(f)
+        self.directory = directory
+        self.puzzle = puzzle_from_spec(manifest["spec"])
+        self.tables = {name: load_npy(os.path.join(directory, f"{name}.npy")) for name in manifest["tables"]}
+        self.valid = self.tables["valid"]
+        self.distance = self.tables["distance"]
+
+    @classmethod
+    def attach(cls, spec, root=None):
+        return cls(table_directory(spec, root))
+
+    def is_valid(self, state):
+        return bool(self.valid[self.puzzle.encode(state)])
+
+    def distance_to_goal(self, state):
+        """Exact number of crossings left, or None if the goal is out of reach."""
+        distance = int(self.distance[self.puzzle.encode(state)])
+        return None if distance < 0 else distance
+
+    def path_from(self, state):
+        """A shortest path to the goal, read off the table without searching."""
+        puzzle, encode, distance = self.puzzle, self.puzzle.encode, self.distance
+        if distance[encode(state)] < 0:
+            return None
+        path = [state]
+        while state != puzzle.GOAL_STATE:
+            left = distance[encode(state)]
+            state = next(s for s in puzzle.next_states(state) if distance[encode(s)] == left - 1)
+            path.append(state)
+        return path
+
+
+def unpublish_tables(spec, root=None):
+    """Removes the published files of a spec."""
+    directory = table_directory(spec, root)
+    if not os.path.isdir(directory):
+        return
+    for name in os.listdir(directory):
+        os.remove(os.path.join(directory, name))
+    os.rmdir(directory)
+
+
+# --- Worker benchmark ---
+
+def _private_memory():
+    """Anonymous (unshared) resident memory of this process in bytes, Linux only."""
+    try:
+        with open("/proc/self/status", encoding="ascii") as f:
+            for line in f:
+                if line.startswith("RssAnon:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    return None
+
+
+_worker_tables = None
+_worker_startup = None
+
+
+def _init_worker(spec, mode):
+    global _worker_tables, _worker_startup
+    start, memory = time.perf_counter(), _private_memory()
+    if mode == "rebuild":
+        _worker_tables = build_tables(puzzle_from_spec(spec))
+    else:
+        _worker_tables = PuzzleTables.attach(spec).tables
+    after = _private_memory()
+    _worker_startup = (time.perf_counter() - start, None if memory is None else after - memory)
+
+
+def _worker_report(_):
+    time.sleep(0.05)  # Keep the worker busy so every worker gets one task
+    return _worker_startup
+
+
+if __name__ == "__main__":
+    from concurrent.futures import ProcessPoolExecutor
+
+    spec = {"type": "river", "items": [f"Item{i}" for i in range(15)],
+            "eats": [["Item0", "Item1"], ["Item1", "Item2"], ["Item5", "Item9"]], "boat_capacity": 3}
+    unpublish_tables(spec)
+    t0 = time.perf_counter()
+    directory = publish_tables(spec)
+    print(f"Published tables once in {time.perf_counter() - t0:.2f} s to {directory}")
+
+    tables = PuzzleTables(directory)
+    start = tables.puzzle.START_STATE
+    print(f"Distance from the start: {tables.distance_to_goal(start)}, "
+          f"path read from the table: {len(tables.path_from(start)) - 1} steps")
+
+    for mode in ("rebuild", "attach"):
+        for workers in (1, 2, 4):
+            with ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(spec, mode)) as pool:
+                reports = list(pool.map(_worker_report, range(workers)))
+            startup = max(seconds for seconds, _ in reports)
+            private = [memory for _, memory in reports if memory is not None]
+            memory = f", {sum(private) / 1e6:.1f} MB private in total" if private else ""
+            print(f"{mode:>7}, {workers} workers: slowest startup {startup * 1000:.1f} ms{memory}")
+    unpublish_tables(spec)
@@ -0,0 +1,136 @@
+import argparse
+import io
+import json
+import os
+import runpy
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from puzzle_specs import puzzle_from_spec, solve_spec
+
+
+# --- Streaming batch solver ---
+# Reads NDJSON puzzle requests from a file or stdin, one line at a time,
+# and writes one NDJSON result line per request, in input order.  A line is
+# either a bare spec (see puzzle_specs.py) or, like puzzle_service.py,
+#   {"id": <anything>, "puzzle": <spec>}
+# Results look like solve_spec() plus "line" (and "id" when given):
+#   {"line": 1, "id": ..., "spec": {...}, "status": "solved", "path": [...], ...}
+#   {"line": 2, "error": "..."}
+# With several workers at most `window` lines are in flight, so memory stays
+# bounded however large the batch file is.
+#
+# `--demo lab1.py` runs the __main__ demo of a lab script (it stays in the
+# lab file), and --classic runs every lab demo in turn.
+
+
+DEMOS = ("lab1.py", "main.py", "lab2.py", "Marya_lab2.py")
+
+
+def run_demo(name):
+    """Runs a lab script (see DEMOS) as if it was started directly."""
+    runpy.run_path(os.path.join(os.path.dirname(os.path.abspath(__file__)), name), run_name="__main__")
+
+
+def solve_line(line_no, line, timeout=None, text=False):
+    """Solves one request line and returns the output it produces."""
+    request_id = None
+    try:
+        request = json.loads(line)
+        if isinstance(request, dict) and "puzzle" in request:
+            request_id, spec = request.get("id"), request["puzzle"]
+        else:
+            spec = request
+        result = solve_spec(spec, timeout)
+    except Exception as e:  # One bad request must not end the stream
+        record = {"line": line_no}
+        if request_id is not None:
+            record["id"] = request_id
+        record["error"] = str(e)
+        return json.dumps(record) + "\n"
+
+    if text:
+        return _format_text(line_no, request_id, spec, result)
+    record = {"line": line_no}
+    if request_id is not None:
+        record["id"] = request_id
+    record.update(result)
+    return json.dumps(record) + "\n"
+
+
+def _format_text(line_no, request_id, spec, result):
+    out = io.StringIO()
+    out.write("=" * 75 + "\n")
+    out.write(f"{request_id or f'Line {line_no}'} ({result['status']}, {result['elapsed'] * 1000:.1f} ms)\n")
+    if result["status"] in ("solved", "no_solution"):
+        # JSON turned tuple states into lists
+        path = [tuple(state) if isinstance(state, list) else state for state in result["path"] or ()]
+        puzzle_from_spec(spec).print_solution(path, out=out)
+    return out.getvalue()
+
+
+def solve_stream(lines, out, workers=1, window=None, timeout=None, text=False):
+    """
+    Solves every non-blank line of an iterable of NDJSON lines and writes
+    the results to out as they become available.  Returns the number of
+    requests handled.
+    """
+    requests = ((line_no, line) for line_no, line in enumerate(lines, 1) if line.strip())
+    count = 0
+    if workers == 1:
+        for line_no, line in requests:
+            out.write(solve_line(line_no, line, timeout, text))
+            out.flush()
+            count += 1
+        return count
+
+    window = window or 4 * workers
+    pending = deque()
+    with ProcessPoolExecutor(workers) as executor:
+        for line_no, line in requests:
+            pending.append(executor.submit(solve_line, line_no, line, timeout, text))
+            if len(pending) >= window:
+                out.write(pending.popleft().result())
+                out.flush()
+                count += 1
+        while pending:
+            out.write(pending.popleft().result())
+            out.flush()
+            count += 1
+    return count
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Solve a stream of NDJSON puzzle specs")
+    parser.add_argument("input", nargs="?", default="-", help="NDJSON file, or - for stdin")
+    parser.add_argument("-o", "--output", default="-", help="result file, or - for stdout")
+    parser.add_argument("--workers", type=int, default=1, help="solver processes")
+    parser.add_argument("--window", type=int, default=None, help="max requests in flight (default 4 per worker)")
+    parser.add_argument("--timeout", type=float, default=None, help="seconds allowed per puzzle")
+    parser.add_argument("--format", choices=("ndjson", "text"), default="ndjson")
+    parser.add_argument("--demo", choices=sorted(DEMOS), help="run the demo of one lab script")
+    parser.add_argument("--classic", action="store_true", help="run the demos of every lab script")
+    args = parser.parse_args()
+
+    if args.demo or args.classic:
+        for name in [args.demo] if args.demo else DEMOS:
+            run_demo(name)
+        sys.exit(0)
+
+    if args.input == "-":
+        source = sys.stdin
+    else:
+        source = open(args.input, encoding="utf-8")
+    out = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8")
+    text = args.format == "text"
+
+    start = time.perf_counter()
+    try:
+        count = solve_stream(source, out, args.workers, args.window, args.timeout, text)
+    finally:
+        for f in (source, out):
+            if f not in (sys.stdin, sys.stdout) and hasattr(f, "close"):
+                f.close()
+    print(f"Solved {count} requests in {time.perf_counter() - start:.2f} s", file=sys.stderr)
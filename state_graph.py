@@ -0,0 +1,214 @@
+import ast
+import mmap
+import os
+import struct
+import sys
+from array import array
+
+from state_labels import encode_state
+
+try:
+    import numpy as np
+except ImportError:  # Arrays are then loaded as read-only memoryviews
+    np = None
+
+
+# --- Export the whole reachable state space as a CSR graph ---
+# Every reachable state gets an id in BFS order from the start state:
+#   indptr.npy   int64, indptr[i]..indptr[i + 1] is the slice of row i
+#   indices.npy  int32, ids of the successors of each state
+#   states.npy   int64, integer encoding of each state (id -> state)
+# The files use the standard .npy format, so numpy.load(..., mmap_mode="r")
+# maps them without copying.  Without NumPy they are memory-mapped and
+# exposed as typed memoryviews, which the queries below also accept.
+
+_NPY_TYPES = {"q": "<i8", "i": "<i4", "h": "<i2", "b": "|i1", "B": "|u1"}
+_NPY_TYPECODES = {descr: typecode for typecode, descr in _NPY_TYPES.items()}
+
+
+def write_npy(filename, values, typecode):
+    data = values if isinstance(values, array) and values.typecode == typecode else array(typecode, values)
+    if sys.byteorder == "big":
+        data = array(typecode, data)
+        data.byteswap()
+    header = f"{{'descr': '{_NPY_TYPES[typecode]}', 'fortran_order': False, 'shape': ({len(data)},), }}"
+    # Pad with spaces so the data starts on a 64-byte boundary
+    padding = 64 - (10 + len(header) + 1) % 64
+    header = (header + " " * padding + "\n").encode("latin1")
+    with open(filename, "wb") as f:
+        f.write(b"\x93NUMPY\x01\x00" + struct.pack("<H", len(header)) + header)
+        data.tofile(f)
+
+
+def load_npy(filename):
+    """Maps a 1-D .npy file read-only, without copying the data."""
+    if np is not None:
+        return np.load(filename, mmap_mode="r")
+    with open(filename, "rb") as f:
+        prefix = f.read(10)
+        if prefix[:8] != b"\x93NUMPY\x01\x00":
+            raise ValueError(f"{filename} is not a version 1.0 .npy file")
+        header_length = struct.unpack("<H", prefix[8:])[0]
+        header = ast.literal_eval(f.read(header_length).decode("latin1"))
+        if header["fortran_order"] or len(header["shape"]) != 1 or sys.byteorder == "big":
+            raise ValueError(f"{filename}: only little-endian 1-D arrays are supported")
+        offset = 10 + header_length
+        if os.path.getsize(filename) == offset:
+            return memoryview(array(_NPY_TYPECODES[header["descr"]]))
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    return memoryview(mapped)[offset:].cast(_NPY_TYPECODES[header["descr"]])
+
+
+def enumerate_graph(start, successors, encode=None):
+    """
+    Visits every state reachable from start.  Returns (codes, indptr,
+    indices) where codes[i] is the integer encoding of state i.
+    """
+    encode = encode or _default_encode
+    ids = {start: 0}
+    states = [start]
+    indptr = array("q", [0])
+    indices = array("i")
+
+    for state in states:  # states grows while we walk it: a BFS
+        for next_state in successors(state):
+            state_id = ids.get(next_state)
+            if state_id is None:
+                state_id = ids[next_state] = len(states)
+                states.append(next_state)
+            indices.append(state_id)
+        indptr.append(len(indices))
+    return array("q", [encode(state) for state in states]), indptr, indices
+
+
+def _default_encode(state):
+    if isinstance(state, int):
+        return state
+    if isinstance(state, tuple) and state and state[0] in ("S", "N"):
+        return encode_state(state)  # lab1.py / main.py tuples
+    if hasattr(state, "missionaries"):
+        # lab2.py / Marya_lab2.py State objects
+        return (state.missionaries * 64 + state.cannibals) * 2 + state.boat
+    raise TypeError(f"no integer encoding for {state!r}; pass encode=")
+
+
+def export_csr(directory, start, successors, encode=None):
+    """Enumerates the state space and writes indptr / indices / states .npy files."""
+    codes, indptr, indices = enumerate_graph(start, successors, encode)
+    os.makedirs(directory, exist_ok=True)
+    write_npy(os.path.join(directory, "indptr.npy"), indptr, "q")
+    write_npy(os.path.join(directory, "indices.npy"), indices, "i")
+    write_npy(os.path.join(directory, "states.npy"), codes, "q")
+    return len(codes), len(indices)
+
+
+def export_puzzle(puzzle, directory):
+    """Exports a RiverPuzzle / MissionariesCannibalsPuzzle state space."""
+    return export_csr(directory, puzzle.START_STATE, puzzle.next_states, puzzle.encode)
+
+
+class CSRGraph:
+    def __init__(self, indptr, indices, states):
+        self.indptr = indptr
+        self.indices = indices
+        self.states = states
+        self._ids = None
+
+    @classmethod
+    def load(cls, directory):
+        return cls(load_npy(os.path.join(directory, "indptr.npy")),
+                   load_npy(os.path.join(directory, "indices.npy")),
+                   load_npy(os.path.join(directory, "states.npy")))
+
+    def __len__(self):
+        return len(self.states)
+
+    def state_id(self, code):
+        """Id of an integer-encoded state (the reverse map is built on first use)."""
+        if self._ids is None:
+            self._ids = {int(c): i for i, c in enumerate(self.states)}
+        return self._ids[code]
+
+    def neighbors(self, state_id):
+        return self.indices[self.indptr[state_id]:self.indptr[state_id + 1]]
+
+    def distances(self, source):
+        """BFS distances from source to every id (-1 if unreachable)."""
+        indptr, indices = self.indptr, self.indices
+        distance = array("q", [-1]) * len(self.states)
+        distance[source] = 0
+        layer = [source]
+        depth = 0
+        while layer:
+            depth += 1
+            next_layer = []
+            for node in layer:
+                for i in range(indptr[node], indptr[node + 1]):
+                    neighbor = int(indices[i])
+                    if distance[neighbor] < 0:
+                        distance[neighbor] = depth
+                        next_layer.append(neighbor)
+            layer = next_layer
+        return distance
+
+    def shortest_path(self, source, target):
+        """Ids on a shortest path from source to target, or None."""
+        indptr, indices = self.indptr, self.indices
+        parent = array("q", [-1]) * len(self.states)
+        parent[source] = source
+        layer = [source]
+        while layer and parent[target] < 0:
+            next_layer = []
+            for node in layer:
+                for i in range(indptr[node], indptr[node + 1]):
+                    neighbor = int(indices[i])
+                    if parent[neighbor] < 0:
+                        parent[neighbor] = node
+                        next_layer.append(neighbor)
+            layer = next_layer
+        if parent[target] < 0:
+            return None
+        path = [target]
+        while path[-1] != source:
+            path.append(parent[path[-1]])
+        path.reverse()
+        return path
+
+    def dead_ends(self):
+        """Ids of states without any valid move."""
+        indptr = self.indptr
+        return [i for i in range(len(self.states)) if indptr[i] == indptr[i + 1]]
+
+
+if __name__ == "__main__":
+    import tempfile
+    import time
+
+    import lab2
+    from lab1 import RiverProblemSolvingAgent
+    from river_puzzle import RiverPuzzle
+
+    root = tempfile.mkdtemp(prefix="state_graph_")
+
+    agent = RiverProblemSolvingAgent()
+    export_csr(os.path.join(root, "lab1"), agent.START_STATE, agent._get_next_states)
+    graph = CSRGraph.load(os.path.join(root, "lab1"))
+    path = graph.shortest_path(0, graph.state_id(encode_state(agent.GOAL_STATE)))
+    print(f"lab1 river: {len(graph)} states, shortest path {len(path) - 1} steps")
+
+    export_csr(os.path.join(root, "lab2"), lab2.State(3, 3, 0), lab2.get_successors)
+    graph = CSRGraph.load(os.path.join(root, "lab2"))
+    print(f"lab2 M&C: {len(graph)} states, {len(graph.dead_ends())} dead ends, "
+          f"farthest state {max(graph.distances(0))} trips away")
+
+    puzzle = RiverPuzzle(items=[f"Item{i}" for i in range(15)],
+                         eats=[("Item0", "Item1"), ("Item2", "Item3")], boat_capacity=2)
+    t0 = time.perf_counter()
+    states, edges = export_puzzle(puzzle, os.path.join(root, "river15"))
+    print(f"river15: exported {states} states / {edges} edges in {time.perf_counter() - t0:.2f} s")
+    t0 = time.perf_counter()
+    graph = CSRGraph.load(os.path.join(root, "river15"))
+    path = graph.shortest_path(0, graph.state_id(puzzle.GOAL_STATE))
+    print(f"river15: loaded and queried in {time.perf_counter() - t0:.2f} s, "
+          f"{len(path) - 1} steps (solve(): {len(puzzle.solve()) - 1})")
+    print(f"Arrays written to {root}")
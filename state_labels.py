@@ -0,0 +1,68 @@
+import sys
+
+
+# --- Precomputed labels for river-crossing states ---
+# A river state with N entities has only 2^N bank assignments, so every
+# label can be built once and looked up by the state's integer encoding:
+# bit i is set when entity i is on the North bank.
+
+EAGER_LIMIT = 12  # Up to 2^12 labels are built up front, larger tables fill lazily
+
+
+def encode_state(state, north='N'):
+    """Encodes a ('S'/'N', ...) tuple as an integer (bit i = entity i on North)."""
+    code = 0
+    for i, bank in enumerate(state):
+        if bank == north:
+            code |= 1 << i
+    return code
+
+
+def decode_state(code, size):
+    """Turns an integer encoding back into a ('S'/'N', ...) tuple."""
+    return tuple('N' if code >> i & 1 else 'S' for i in range(size))
+
+
+def bracket_label(south, north):
+    """South: [Farmer, Wolf] | North: [Empty]  (lab1.py style)"""
+    south_str = ", ".join(south) if south else "Empty"
+    north_str = ", ".join(north) if north else "Empty"
+    return f"South: [{south_str}] | North: [{north_str}]"
+
+
+def list_label(south, north):
+    """South: ['Farmer', 'Wolf'] | North: ['Empty']  (main.py style)"""
+    return f"South: {south if south else ['Empty']} | North: {north if north else ['Empty']}"
+
+
+class StateLabelTable:
+    def __init__(self, names=("Farmer", "Wolf", "Duck", "Corn"), label=bracket_label):
+        self.names = tuple(names)
+        self._label = label
+        size = 1 << len(self.names)
+        if len(self.names) <= EAGER_LIMIT:
+            self._table = [self._build(code) for code in range(size)]
+        else:
+            self._table = {}
+
+    def _build(self, code):
+        south = [name for i, name in enumerate(self.names) if not code >> i & 1]
+        north = [name for i, name in enumerate(self.names) if code >> i & 1]
+        return self._label(south, north)
+
+    def label(self, code):
+        """Returns the label for an integer-encoded state."""
+        table = self._table
+        if isinstance(table, list):
+            return table[code]
+        text = table.get(code)
+        if text is None:
+            text = table[code] = self._build(code)
+        return text
+
+    def write_path(self, codes, out=None):
+        """Writes 'Step i: <label>' for a whole path of codes in a single write."""
+        label = self.label
+        text = "".join([f"Step {i}: {label(code)}\n" for i, code in enumerate(codes)])
+        (out or sys.stdout).write(text)
+        return text
@@ -0,0 +1,147 @@
+from array import array
+from math import comb
+
+
+# --- Perfect ranking of multi-type count states ---
+# A count state says how many passengers of each type are on each bank and
+# where the boat is, like lab2.py's State(missionaries, cannibals, boat).
+# Written as a tuple it lists, type by type, the counts on every bank but
+# the last (that one is implied by the total), then the boat position:
+#   2 banks:  (m_left, c_left, boat)          (mc_puzzle.py states)
+#   3 banks:  (m_0, m_1, c_0, c_1, boat)
+# rank() maps every such state to a distinct integer in [0, size) and
+# unrank() maps it back, so visited sets, parent links and distance tables
+# can be flat arrays indexed by rank.  With two banks the rank is the plain
+# mixed-radix number (m * (C + 1) + c) * 2 + boat.
+# The ranking covers all count states, valid or not; invalid ones simply
+# stay unused in the arrays.
+
+class CountRanker:
+    def __init__(self, totals, banks=2, boat_positions=None):
+        self.totals = tuple(totals)
+        self.banks = banks
+        self.boat_positions = banks if boat_positions is None else boat_positions
+        # Ways to split n passengers of one type over the banks: C(n + B - 1, B - 1)
+        self.radices = tuple(comb(n + banks - 1, banks - 1) for n in self.totals)
+        self.size = self.boat_positions
+        for radix in self.radices:
+            self.size *= radix
+        # _suffix[r][j]: ways to split r passengers over the last j banks
+        top = max(self.totals, default=0)
+        self._suffix = [[comb(r + j - 1, j - 1) if j else int(r == 0) for j in range(banks + 1)]
+                        for r in range(top + 1)]
+
+    def __len__(self):
+        return self.size
+
+    def _rank_split(self, counts, total):
+        # Splits of `total` that put fewer passengers on the first bank come
+        # first; by the hockey-stick identity their number is
+        # suffix[r][j] - suffix[r - x][j], so every bank costs O(1)
+        suffix = self._suffix
+        rank, remaining = 0, total
+        for i, x in enumerate(counts):
+            j = self.banks - i
+            rank += suffix[remaining][j] - suffix[remaining - x][j]
+            remaining -= x
+        return rank
+
+    def _unrank_split(self, rank, total):
+        suffix = self._suffix
+        counts, remaining = [], total
+        for i in range(self.banks - 1):
+            j = self.banks - i
+            # Binary search for the largest x whose splits-before count
+            # (see _rank_split) is <= rank
+            base = suffix[remaining][j]
+            low, high = 0, remaining
+            while low < high:
+                mid = (low + high + 1) // 2
+                if base - suffix[remaining - mid][j] <= rank:
+                    low = mid
+                else:
+                    high = mid - 1
+            x = low
+            rank -= base - suffix[remaining - x][j]
+            counts.append(x)
+            remaining -= x
+        return counts
+
+    def rank(self, state):
+        """Dense index of a count state, in [0, size)."""
+        if self.banks == 2:
+            # One count per type: the rank is a mixed-radix number
+            rank = 0
+            for total, count in zip(self.totals, state):
+                if not 0 <= count <= total:
+                    raise ValueError(f"{state!r} is not a state for totals {self.totals}")
+                rank = rank * (total + 1) + count
+            return rank * self.boat_positions + state[-1]
+
+        per_type = self.banks - 1
+        rank = 0
+        for t, (total, radix) in enumerate(zip(self.totals, self.radices)):
+            counts = state[t * per_type:(t + 1) * per_type]
+            if sum(counts) > total or min(counts, default=0) < 0:
+                raise ValueError(f"{state!r} is not a state for totals {self.totals}")
+            rank = rank * radix + self._rank_split(counts, total)
+        return rank * self.boat_positions + state[-1]
+
+    def unrank(self, rank):
+        """The count state with this rank."""
+        if not 0 <= rank < self.size:
+            raise ValueError(f"rank {rank} out of range [0, {self.size})")
+        rank, boat = divmod(rank, self.boat_positions)
+        splits = []
+        for total, radix in zip(reversed(self.totals), reversed(self.radices)):
+            rank, split = divmod(rank, radix)
+            splits.append(self._unrank_split(split, total))
+        state = []
+        for counts in reversed(splits):
+            state.extend(counts)
+        state.append(boat)
+        return tuple(state)
+
+
+def ranked_bfs(puzzle, ranker):
+    """
+    BFS over a puzzle whose states the ranker can rank, keeping parents in
+    a flat array instead of a dict.  Returns the path, or None.
+    """
+    rank, unrank = ranker.rank, ranker.unrank
+    parent = array("q", [-1]) * ranker.size
+    start, goal = rank(puzzle.START_STATE), rank(puzzle.GOAL_STATE)
+    parent[start] = start
+    layer = [puzzle.START_STATE]
+    while layer and parent[goal] < 0:
+        next_layer = []
+        for state in layer:
+            state_rank = rank(state)
+            for next_state in puzzle.next_states(state):
+                next_rank = rank(next_state)
+                if parent[next_rank] < 0:
+                    parent[next_rank] = state_rank
+                    next_layer.append(next_state)
+        layer = next_layer
+    if parent[goal] < 0:
+        return None
+    path = [goal]
+    while path[-1] != start:
+        path.append(parent[path[-1]])
+    return [unrank(r) for r in reversed(path)]
+
+
+if __name__ == "__main__":
+    from mc_puzzle import MissionariesCannibalsPuzzle
+
+    ranker = CountRanker((3, 3))
+    print(f"lab2.py states: {len(ranker)} ranks, (3, 3, 0) -> {ranker.rank((3, 3, 0))}, "
+          f"(0, 0, 1) -> {ranker.rank((0, 0, 1))}")
+
+    ranker = CountRanker((4, 3, 2), banks=3)
+    assert all(ranker.rank(ranker.unrank(r)) == r for r in range(len(ranker)))
+    print(f"Three types on three banks: {len(ranker)} ranks, round trip verified")
+
+    puzzle = MissionariesCannibalsPuzzle(missionaries=50, cannibals=50, boat_capacity=4)
+    path = ranked_bfs(puzzle, CountRanker((50, 50)))
+    print(f"M&C 50/50 with array parents: {len(path) - 1} steps (dict BFS: {len(puzzle.solve()) - 1})")
@@ -0,0 +1,69 @@
+import time
+
+
+# --- Lean successor generators ---
+# The classic river states of lab1.py and main.py are (Farmer, Wolf, Duck,
+# Corn) tuples of 'S'/'N'.  Whether a crossing is safe only depends on who
+# stays behind, so every move is checked on the unpacked banks first and
+# the new tuple is only built for safe moves; nothing else is allocated.
+
+def iter_river_successors(state):
+    """Yields the valid states one crossing away, in lab1.py's move order."""
+    farmer, wolf, duck, corn = state
+    destination = 'N' if farmer == 'S' else 'S'
+
+    # Farmer alone: the wolf/duck and duck/corn pairs stay with nobody
+    if not (wolf == duck == farmer or duck == corn == farmer):
+        yield (destination, wolf, duck, corn)
+    # Farmer + Wolf: only the duck and the corn are left behind
+    if wolf == farmer and not duck == corn == farmer:
+        yield (destination, destination, duck, corn)
+    # Farmer + Duck: the duck is in every pair, so this is always safe
+    if duck == farmer:
+        yield (destination, wolf, destination, corn)
+    # Farmer + Corn: only the wolf and the duck are left behind
+    if corn == farmer and not wolf == duck == farmer:
+        yield (destination, wolf, duck, destination)
+
+
+# --- Micro-benchmarks ---
+
+def benchmark(successors, states, seconds=0.5):
+    """Runs successors over states for about `seconds`; returns (states/s, calls/s)."""
+    generated = calls = 0
+    start = time.perf_counter()
+    while time.perf_counter() - start < seconds:
+        for state in states:
+            for _ in successors(state):
+                generated += 1
+        calls += len(states)
+    elapsed = time.perf_counter() - start
+    return generated / elapsed, calls / elapsed
+
+
+if __name__ == "__main__":
+    from itertools import product
+
+    import lab2
+    import Marya_lab2
+    from lab1 import RiverProblemSolvingAgent
+    from mc_puzzle import MissionariesCannibalsPuzzle
+
+    agent = RiverProblemSolvingAgent()
+    river_states = [state for state in product('SN', repeat=4) if agent._is_valid(state)]
+    lab2_states = [lab2.State(m, c, b) for m, c, b in product(range(4), range(4), range(2))
+                   if lab2.valid_counts(m, c)]
+    marya_states = [Marya_lab2.State(m, c, b) for m, c, b in product(range(4), range(4), range(2))
+                    if Marya_lab2.valid_counts(m, c)]
+    puzzle = MissionariesCannibalsPuzzle(missionaries=50, cannibals=50, boat_capacity=6)
+    mc_states = [state for state in product(range(51), range(51), range(2)) if puzzle.is_valid(state)]
+
+    cases = [
+        ("lab1.py / main.py iter_river_successors", iter_river_successors, river_states),
+        ("lab2.py get_successors", lab2.get_successors, lab2_states),
+        ("Marya_lab2.py get_successors", Marya_lab2.get_successors, marya_states),
+        ("MissionariesCannibalsPuzzle.next_states", puzzle.next_states, mc_states),
+    ]
+    for name, successors, states in cases:
+        per_state, per_call = benchmark(successors, states)
+        print(f"{name:<42}{per_state:>12,.0f} states/s{per_call:>12,.0f} calls/s")
@@ -0,0 +1,125 @@
+from search import bfs, bounded_bfs
+
+
+# --- Symmetry reduction for river puzzles with interchangeable items ---
+# Two items are interchangeable when swapping them maps the eats-graph onto
+# itself (for example several identical ducks).  Whether a state is valid
+# then only depends on how many items of each group are on the North bank,
+# so every state can be replaced by a canonical representative: in each
+# group the lowest-numbered items are the ones on the North bank.  This is
+# the same idea as counting missionaries instead of tracking each one.
+# Only constraints expressed through the eats-graph are detected; rules such
+# as jealous husbands do not fit RiverPuzzle and are not covered.
+
+def interchangeable_groups(puzzle):
+    """Returns lists of bit positions of items that can be swapped freely."""
+    index = {name: i for i, name in enumerate(puzzle.names)}
+    eats = {(index[eater], index[eaten]) for eater, eaten in puzzle.eats}
+
+    def swap_is_symmetry(a, b):
+        swap = {a: b, b: a}
+        return {(swap.get(x, x), swap.get(y, y)) for x, y in eats} == eats
+
+    groups = []
+    for item in range(1, len(puzzle.names)):
+        # Swaps compose, so checking against one member of a group is enough
+        for group in groups:
+            if swap_is_symmetry(group[0], item):
+                group.append(item)
+                break
+        else:
+            groups.append([item])
+    return [group for group in groups if len(group) > 1]
+
+
+class SymmetricRiverPuzzle:
+    def __init__(self, puzzle):
+        self.puzzle = puzzle
+        self.groups = interchangeable_groups(puzzle)
+        self._group_masks = [sum(1 << bit for bit in group) for group in self.groups]
+        # _north_masks[g][k]: the canonical k items of group g on the North bank
+        self._north_masks = [[sum(1 << bit for bit in group[:k]) for k in range(len(group) + 1)]
+                             for group in self.groups]
+        self._fixed_mask = ~sum(self._group_masks)
+
+        self.START_STATE = self.canonical(puzzle.START_STATE)
+        self.GOAL_STATE = self.canonical(puzzle.GOAL_STATE)
+
+    def spec(self):
+        return self.puzzle.spec()
+
+    def canonical(self, state):
+        canonical = state & self._fixed_mask
+        for group_mask, north_masks in zip(self._group_masks, self._north_masks):
+            canonical |= north_masks[bin(state & group_mask).count("1")]
+        return canonical
+
+    def counts(self, state):
+        """The count-vector view: (farmer bit, items of each group on North)."""
+        return (state & 1,) + tuple(bin(state & mask).count("1") for mask in self._group_masks)
+
+    def is_valid(self, state):
+        return self.puzzle.is_valid(state)
+
+    def heuristic(self, state):
+        return self.puzzle.heuristic(state)
+
+    def next_states(self, state):
+        seen = set()
+        canonical_states = []
+        for next_state in self.puzzle.next_states(state):
+            next_state = self.canonical(next_state)
+            if next_state not in seen:
+                seen.add(next_state)
+                canonical_states.append(next_state)
+        return canonical_states
+
+    def expand(self, path):
+        """Turns a path of canonical states into concrete, valid moves."""
+        if not path:
+            return path
+        concrete = [self.puzzle.START_STATE]
+        state = concrete[0]
+        for prev, curr in zip(path, path[1:]):
+            # Items outside any group (and the farmer) move exactly as shown
+            state ^= (prev ^ curr) & self._fixed_mask
+            for group, group_mask in zip(self.groups, self._group_masks):
+                moved = bin(curr & group_mask).count("1") - bin(prev & group_mask).count("1")
+                to_north = moved > 0
+                # Pick any members on the bank the farmer is leaving
+                candidates = [bit for bit in group if bool(state >> bit & 1) != to_north]
+                for bit in candidates[:abs(moved)]:
+                    state ^= 1 << bit
+            concrete.append(state)
+        return concrete
+
+    def solve(self):
+        """BFS over canonical states, expanded back to a concrete path."""
+        return self.expand(bfs(self))
+
+
+if __name__ == "__main__":
+    import time
+
+    from river_puzzle import RiverPuzzle
+
+    wolves = [f"Wolf{i}" for i in range(5)]
+    ducks = [f"Duck{i}" for i in range(3)]
+    corn = [f"Corn{i}" for i in range(6)]
+    puzzle = RiverPuzzle(items=wolves + ducks + corn,
+                         eats=[(w, d) for w in wolves for d in ducks] + [(d, c) for d in ducks for c in corn],
+                         boat_capacity=4)
+    reduced = SymmetricRiverPuzzle(puzzle)
+    print("Interchangeable groups:", [[puzzle.names[bit] for bit in group] for group in reduced.groups])
+
+    for name, target in (("Full state space", puzzle), ("Canonical states", reduced)):
+        t0 = time.perf_counter()
+        result = bounded_bfs(target)
+        elapsed = time.perf_counter() - t0
+        print(f"{name}: {result.stats['visited']} states visited, "
+              f"{len(result.path) - 1} steps, {elapsed * 1000:.1f} ms")
+
+    path = reduced.solve()
+    assert all(b in puzzle.next_states(a) for a, b in zip(path, path[1:]))
+    assert path[0] == puzzle.START_STATE and path[-1] == puzzle.GOAL_STATE
+    print("Expanded concrete path is valid:", len(path) - 1, "steps")